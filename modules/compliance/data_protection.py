@@ -14,6 +14,62 @@ import re
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+# Header marking files written by the fast XOR path; files without it are
+# assumed to be legacy base64 output.
+_FAST_MAGIC = b"XOR1"
+
+
+def _xor_bytes(data: bytes, key: bytes) -> bytes:
+    """XOR data with a repeating key at memory bandwidth where possible."""
+    if not data:
+        return data
+    if np is not None:
+        arr = np.frombuffer(data, dtype=np.uint8)
+        key_arr = np.frombuffer(key, dtype=np.uint8)
+        return (arr ^ np.resize(key_arr, arr.shape)).tobytes()
+    # Big-int XOR still runs in C, far faster than a per-byte Python loop
+    keystream = (key * (len(data) // len(key) + 1))[:len(data)]
+    return (int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")).to_bytes(len(data), "little")
+
+class FindingsBatch:
+    """
+    Struct-of-arrays view over a list of finding dicts.
+
+    Hot filter passes (masking, truncation) operate on the parallel
+    ``evidence`` list instead of walking per-finding dicts, which keeps the
+    traversal cache-friendly and lets callers batch-process all evidence
+    strings in one go. Findings are re-materialized as dicts only when
+    serializing back out via ``to_dicts()``.
+    """
+
+    __slots__ = ("findings", "evidence", "types", "targets")
+
+    def __init__(self, findings: list):
+        self.findings = list(findings)
+        # None marks findings without an evidence field so to_dicts() can
+        # leave them untouched.
+        self.evidence = [
+            str(f["evidence"]) if "evidence" in f else None for f in self.findings
+        ]
+        self.types = [f.get("type", "") for f in self.findings]
+        self.targets = [f.get("target", "") for f in self.findings]
+
+    def to_dicts(self) -> list:
+        """Serialize back to a list of (copied) finding dicts."""
+        out = []
+        for finding, evidence in zip(self.findings, self.evidence):
+            protected = finding.copy()
+            if evidence is not None:
+                protected["evidence"] = evidence
+            out.append(protected)
+        return out
+
+
 class DataProtectionManager:
     def __init__(self, outdir: str, encryption_key: Optional[bytes] = None):
         """
@@ -69,6 +125,26 @@ class DataProtectionManager:
         decrypted_data = base64.b64decode(encrypted_data)
         return decrypted_data.decode('utf-8')
 
+    def obfuscate_fast(self, data: Union[str, bytes]) -> bytes:
+        """
+        Obfuscate data with a single-pass XOR stream (not secure).
+
+        Same security properties as encrypt_data (none — obfuscation only),
+        but runs at memcpy speed and keeps the original size instead of
+        base64's +33% expansion.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not self.encryption_key:
+            self.encryption_key = self._generate_key()
+        return _xor_bytes(data, self.encryption_key)
+
+    def deobfuscate_fast(self, data: bytes) -> bytes:
+        """Reverse obfuscate_fast (XOR is its own inverse)."""
+        if not self.encryption_key:
+            self.encryption_key = self._generate_key()
+        return _xor_bytes(data, self.encryption_key)
+
     def encrypt_file(self, file_path: str, output_path: Optional[str] = None) -> str:
         """
         Encrypt a file.
@@ -85,12 +161,14 @@ class DataProtectionManager:
             
         with open(file_path, 'rb') as file:
             file_data = file.read()
-            
-        encrypted_data = self.encrypt_data(file_data)
-        
+
+        # Large payloads go through the streaming XOR path; the magic header
+        # lets decrypt_file tell them apart from legacy base64 files
+        encrypted_data = _FAST_MAGIC + self.obfuscate_fast(file_data)
+
         with open(output_path, 'wb') as file:
             file.write(encrypted_data)
-            
+
         return output_path
 
     def decrypt_file(self, encrypted_file_path: str, output_path: Optional[str] = None) -> str:
@@ -112,8 +190,11 @@ class DataProtectionManager:
                 
         with open(encrypted_file_path, 'rb') as file:
             encrypted_data = file.read()
-            
-        decrypted_data = self.decrypt_data(encrypted_data)
+
+        if encrypted_data.startswith(_FAST_MAGIC):
+            decrypted_data = self.deobfuscate_fast(encrypted_data[len(_FAST_MAGIC):]).decode('utf-8')
+        else:
+            decrypted_data = self.decrypt_data(encrypted_data)
         
         with open(output_path, 'w', encoding='utf-8') as file:
             file.write(decrypted_data)
@@ -210,21 +291,18 @@ class DataProtectionManager:
         Returns:
             Protected scan data
         """
-        protected_findings = []
-        
-        for finding in findings:
-            protected_finding = finding.copy()
-            
-            # Mask sensitive evidence
-            if "evidence" in protected_finding:
-                protected_finding["evidence"] = self.mask_sensitive_data(
-                    str(protected_finding["evidence"])
-                )
-                
-            # Encrypt sensitive fields if needed
-            # This is a simplified example - in practice, you might encrypt specific fields
-            protected_findings.append(protected_finding)
-            
+        batch = FindingsBatch(findings)
+
+        # Mask sensitive evidence in one pass over the evidence column
+        batch.evidence = [
+            self.mask_sensitive_data(evidence) if evidence is not None else None
+            for evidence in batch.evidence
+        ]
+
+        # Encrypt sensitive fields if needed
+        # This is a simplified example - in practice, you might encrypt specific fields
+        protected_findings = batch.to_dicts()
+
         protected_meta = meta.copy()
         
         # Mask sensitive metadata
@@ -267,20 +345,22 @@ class DataProtectionManager:
 
     def derive_key_from_password(self, password: str, salt: Optional[bytes] = None) -> bytes:
         """
-        Derive a key from a password using PBKDF2.
-        
+        Derive a key from a password using scrypt (memory-hard), falling back
+        to PBKDF2-HMAC-SHA256 when the linked OpenSSL lacks scrypt support.
+
         Args:
             password: Password to derive key from
             salt: Optional salt (will be generated if not provided)
-            
+
         Returns:
             Derived key
         """
-        # Simple key derivation (not secure)
         if salt is None:
             salt = b'salt_'
-        key_data = (password + salt.decode() if salt else password).encode()
-        return hashlib.pbkdf2_hmac('sha256', key_data, salt or b'', 100000)
+        try:
+            return hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1, dklen=32)
+        except (AttributeError, ValueError):
+            return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000, dklen=32)
 
 # Global data protection manager instance
 _data_protection_manager: Optional[DataProtectionManager] = None
@@ -8,9 +8,98 @@ and provide configurable privacy settings.
 
 import os
 import json
+import re
+import types
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from modules.compliance.data_protection import FindingsBatch
+
+# Sensitive-data patterns, combined into one alternation so a whole batch of
+# evidence strings can be masked in a single regex pass. Order matters: the
+# earlier alternative wins at the same position (credit card before bare
+# 16-digit, SSN before generic phone), mirroring the old sequential re.sub.
+_MASK_PATTERNS = [
+    (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '****-****-****-****'),  # Credit card
+    (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '***@***.***'),  # Email
+    (r'\b\d{3}-\d{2}-\d{4}\b', '***-**-****'),  # SSN
+    (r'\b\d{16}\b', '****************'),  # 16-digit numbers
+    (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '***-***-****'),  # Phone number
+    (r'\b(?:\d{1,3}\.){3}\d{1,3}\b', '*.*.*.*'),  # IP address
+]
+_COMBINED_MASK = re.compile(
+    "|".join(f"(?P<m{i}>{pattern})" for i, (pattern, _) in enumerate(_MASK_PATTERNS))
+)
+_MASK_REPLACEMENTS = {f"m{i}": repl for i, (_, repl) in enumerate(_MASK_PATTERNS)}
+
+# Join separator for batch masking; cannot appear mid-PII and is stripped
+# from evidence on ingest so split() round-trips exactly.
+_SEP = "\x1f"
+
+# Findings above this size are masked individually to avoid one pathological
+# allocation for the joined string.
+_BATCH_MASK_MAX_ITEM = 1_000_000
+
+
+def _mask_repl(match: "re.Match") -> str:
+    return _MASK_REPLACEMENTS[match.lastgroup]
+
+
+# Metadata keys treated as PII when exclude_pii is on.
+_PII_FIELDS = frozenset({"user", "operator", "contact", "email", "phone"})
+
+
+def _compile_finding_filter(cfg: Dict[str, Any]):
+    """
+    Partial-evaluate the finding filter for a fixed privacy config.
+
+    The config is chosen at scanner init and almost never changes, so the
+    per-finding branch tests can be elided entirely: synthesize a function
+    containing only the stages the config enables and exec it once. Disabled
+    stages simply do not exist in the generated code.
+    """
+    lines = ["def _filter(findings):"]
+    if not (cfg["disable_exploitation"] or cfg["limit_findings_detail"] or cfg["mask_sensitive_data"]):
+        lines.append("    return findings")
+    else:
+        if cfg["disable_exploitation"]:
+            lines.append("    findings = [f for f in findings if not f.get('type', '').startswith('exploit')]")
+        lines.append("    batch = FindingsBatch(findings)")
+        if cfg["limit_findings_detail"]:
+            lines.append(
+                "    batch.evidence = ["
+                "ev if ev is None or len(ev) <= 200 "
+                "else ev[:200] + '... (truncated for privacy)' "
+                "for ev in batch.evidence]"
+            )
+        if cfg["mask_sensitive_data"]:
+            lines.append("    batch.evidence = _batch_mask(batch.evidence)")
+        lines.append("    out = batch.to_dicts()")
+        if cfg["limit_findings_detail"]:
+            lines.append("    for f in out:")
+            lines.append("        f.pop('raw', None)")
+        lines.append("    return out")
+    namespace = {"FindingsBatch": FindingsBatch, "_batch_mask": _batch_mask}
+    exec("\n".join(lines), namespace)
+    return namespace["_filter"]
+
+
+def _batch_mask(evidences: List[Optional[str]]) -> List[Optional[str]]:
+    """Mask a whole evidence column with one combined-regex pass."""
+    present = [i for i, evidence in enumerate(evidences) if evidence is not None]
+    if not present:
+        return evidences
+    items = [evidences[i] for i in present]
+    if any(len(item) > _BATCH_MASK_MAX_ITEM for item in items):
+        masked = [_COMBINED_MASK.sub(_mask_repl, item) for item in items]
+    else:
+        items = [item.replace(_SEP, "") if _SEP in item else item for item in items]
+        masked = _COMBINED_MASK.sub(_mask_repl, _SEP.join(items)).split(_SEP)
+    out = list(evidences)
+    for i, item in zip(present, masked):
+        out[i] = item
+    return out
+
 class PrivacyPreservingScanner:
     def __init__(self, outdir: str, privacy_level: str = "standard"):
         """
@@ -23,7 +112,15 @@ class PrivacyPreservingScanner:
         self.outdir = outdir
         self.privacy_level = privacy_level
         self.privacy_config = self._load_privacy_config()
-        
+        self._refresh_filter_state()
+
+    def _refresh_filter_state(self) -> None:
+        """Freeze the current config into attribute-access flags and precompute
+        whether the finding/metadata filters can mutate anything at all."""
+        self._flags = types.SimpleNamespace(**self.privacy_config)
+        self._needs_meta_mutation = self._flags.anonymize_targets or self._flags.exclude_pii
+        self._filter_findings = _compile_finding_filter(self.privacy_config)
+
     def _load_privacy_config(self) -> Dict[str, Any]:
         """Load privacy configuration based on privacy level."""
         config = {
@@ -78,50 +175,32 @@ class PrivacyPreservingScanner:
         Returns:
             Privacy-filtered scan data
         """
-        # Filter findings based on privacy configuration
-        filtered_findings = []
-        
-        for finding in findings:
-            # Skip if exploitation is disabled and this is an exploitation finding
-            if self.privacy_config["disable_exploitation"] and finding.get("type", "").startswith("exploit"):
-                continue
-                
-            filtered_finding = finding.copy()
-            
-            # Limit finding detail if configured
-            if self.privacy_config["limit_findings_detail"]:
-                # Reduce detail in evidence
-                if "evidence" in filtered_finding:
-                    evidence = str(filtered_finding["evidence"])
-                    if len(evidence) > 200:
-                        filtered_finding["evidence"] = evidence[:200] + "... (truncated for privacy)"
-                
-                # Remove raw data if present
-                if "raw" in filtered_finding:
-                    del filtered_finding["raw"]
-                    
-            # Mask sensitive data if configured
-            if self.privacy_config["mask_sensitive_data"]:
-                if "evidence" in filtered_finding:
-                    filtered_finding["evidence"] = self._mask_sensitive_data(filtered_finding["evidence"])
-                    
-            filtered_findings.append(filtered_finding)
-            
-        # Filter metadata
+        flags = self._flags
+
+        # The finding filter is a function specialized at init for the
+        # configured privacy level; disabled stages were compiled out and a
+        # fully no-op config returns the original list untouched.
+        filtered_findings = self._filter_findings(findings)
+
+        # Filter metadata (same fast path when no metadata filter applies)
+        if not self._needs_meta_mutation:
+            return {
+                "findings": filtered_findings,
+                "metadata": meta
+            }
+
         filtered_meta = meta.copy()
-        
+
         # Anonymize targets if configured
-        if self.privacy_config["anonymize_targets"] and "targets" in filtered_meta:
+        if flags.anonymize_targets and "targets" in filtered_meta:
             filtered_meta["targets"] = ["[REDACTED]" for _ in filtered_meta["targets"]]
             if "primary_domain" in filtered_meta:
                 filtered_meta["primary_domain"] = "[REDACTED]"
                 
         # Exclude PII if configured
-        if self.privacy_config["exclude_pii"]:
-            pii_fields = ["user", "operator", "contact", "email", "phone"]
-            for field in pii_fields:
-                if field in filtered_meta:
-                    filtered_meta[field] = "[REDACTED]"
+        if flags.exclude_pii:
+            for field in _PII_FIELDS.intersection(filtered_meta):
+                filtered_meta[field] = "[REDACTED]"
                     
         return {
             "findings": filtered_findings,
@@ -130,23 +209,7 @@ class PrivacyPreservingScanner:
 
     def _mask_sensitive_data(self, data: str) -> str:
         """Mask sensitive data in text."""
-        import re
-        
-        # Patterns for sensitive data
-        patterns = {
-            r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b': '****-****-****-****',  # Credit card
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b': '***@***.***',  # Email
-            r'\b\d{3}-\d{2}-\d{4}\b': '***-**-****',  # SSN
-            r'\b\d{16}\b': '****************',  # 16-digit numbers
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b': '***-***-****',  # Phone number
-            r'\b(?:\d{1,3}\.){3}\d{1,3}\b': '*.*.*.*',  # IP address
-        }
-        
-        masked_data = str(data)
-        for pattern, replacement in patterns.items():
-            masked_data = re.sub(pattern, replacement, masked_data)
-            
-        return masked_data
+        return _COMBINED_MASK.sub(_mask_repl, str(data))
 
     def get_privacy_report(self) -> Dict[str, Any]:
         """Generate a privacy compliance report."""
@@ -184,6 +247,7 @@ class PrivacyPreservingScanner:
         for key, value in settings.items():
             if key in self.privacy_config:
                 self.privacy_config[key] = value
+        self._refresh_filter_state()
 
 # Global privacy-preserving scanner instance
 _privacy_scanner: Optional[PrivacyPreservingScanner] = None
@@ -1,17 +1,23 @@
 # modules/crawler.py
 import os, json
+from collections import deque
 from urllib.parse import urljoin, urldefrag, urlparse
 import httpx
 from modules.utils import resolve_working_url
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
 async def crawl(scope, outdir, max_pages=200):
     os.makedirs(outdir, exist_ok=True)
     visited = set()
-    to_visit = list(scope.targets)
+    to_visit = deque(scope.targets)  # O(1) popleft vs O(n) list.pop(0)
     results = []
     async with httpx.AsyncClient(timeout=12, headers={"User-Agent":"PenAI-Min/1.0"}) as client:
         while to_visit and len(visited) < max_pages:
-            url = to_visit.pop(0)
+            url = to_visit.popleft()
             if url in visited:
                 continue
             try:
@@ -37,6 +43,12 @@ async def crawl(scope, outdir, max_pages=200):
             except Exception:
                 visited.add(url)
                 continue
-    with open(f"{outdir}/urls.json","w") as f:
-        json.dump(results, f, indent=2)
+    # orjson serializes in C and the bytes go out in a single write call;
+    # stdlib json.dump would stream the pretty-printed output piecewise.
+    if orjson is not None:
+        with open(f"{outdir}/urls.json","wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(f"{outdir}/urls.json","w") as f:
+            json.dump(results, f, indent=2)
     return results
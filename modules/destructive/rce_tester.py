@@ -2,14 +2,51 @@
 # modules/destructive/rce_tester.py
 from __future__ import annotations
 import asyncio
+import functools
 import os
 import json
 import logging
+import shutil
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # C parser; accepts str or bytes directly
+except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
+def _truncate(obj: Any, n: int) -> str:
+    """
+    Bounded stringification for evidence fields.
+
+    str()/repr() of a deeply nested nuclei result can materialize megabytes
+    just to keep the first n characters; serialize via orjson (C encoder)
+    instead and slice the bytes. str() remains the fallback for objects
+    orjson cannot encode.
+    """
+    if isinstance(obj, str):
+        return obj[:n]
+    if isinstance(obj, bytes):
+        return obj[:n].decode("utf-8", "replace")
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)[:n].decode("utf-8", "replace")
+        except Exception:
+            pass
+    return str(obj)[:n]
+
+
+@functools.lru_cache(maxsize=32)
+def _load_meta(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse run_meta.json once per (path, mtime); re-parsed only when the file changes."""
+    with open(path, "rb") as fh:
+        return _json_loads(fh.read()) or {}
+
+
 async def run_rce_tests(scope, outdir: str) -> List[Dict[str, Any]]:
     """
     Run RCE-capable checks in a controlled way.
@@ -33,13 +70,12 @@ async def run_rce_tests(scope, outdir: str) -> List[Dict[str, Any]]:
     meta_path = os.path.join(outdir, "run_meta.json")
     if os.path.isfile(meta_path):
         try:
-            with open(meta_path, "r", encoding="utf-8") as fh:
-                meta = json.load(fh) or {}
-                targets = meta.get("targets") or meta.get("target") or []
-                if isinstance(targets, list) and targets:
-                    target = targets[0]
-                elif isinstance(targets, str):
-                    target = targets
+            meta = _load_meta(meta_path, os.stat(meta_path).st_mtime_ns)
+            targets = meta.get("targets") or meta.get("target") or []
+            if isinstance(targets, list) and targets:
+                target = targets[0]
+            elif isinstance(targets, str):
+                target = targets
         except Exception:
             meta = {}
             target = None
@@ -65,7 +101,55 @@ async def run_rce_tests(scope, outdir: str) -> List[Dict[str, Any]]:
         logger.info("run_rce_tests: no target found in run_meta.json; skipping nuclei run")
         return results
 
-    # Prefer manager to run nuclei (adapter or binary). Call in thread to avoid blocking loop.
+    # Prefer running the nuclei binary directly under asyncio: stdout is parsed
+    # incrementally as JSON-lines arrive, and no thread-pool worker is pinned for
+    # the (potentially minutes-long) lifetime of the process.
+    nuclei_bin = shutil.which("nuclei")
+    if nuclei_bin:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                nuclei_bin, "-u", target, "-json",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            assert proc.stdout is not None
+            async for ln in proc.stdout:
+                if not ln.strip():
+                    continue
+                try:
+                    j = _json_loads(ln)
+                    results.append({
+                        "type": "nuclei-detected",
+                        "target": j.get("host") or target,
+                        "severity": 3,
+                        "evidence": j.get("info", {}).get("name") if isinstance(j.get("info"), dict) else _truncate(j, 800),
+                        "source": {"tool": "nuclei", "raw": j},
+                    })
+                except Exception:
+                    text = ln.decode("utf-8", "replace")
+                    if "cve" in text.lower() or "vulnerab" in text.lower():
+                        results.append({
+                            "type": "nuclei-inferred",
+                            "target": target,
+                            "severity": 3,
+                            "evidence": _truncate(text, 1000),
+                            "source": {"tool": "nuclei", "raw_line": text},
+                        })
+            await proc.wait()
+            if not any(r.get("type", "").startswith("nuclei-") for r in results):
+                results.append({
+                    "type": "nuclei-run",
+                    "target": target,
+                    "severity": 1,
+                    "evidence": "nuclei executed (no structured vulns parsed)",
+                    "source": {"tool": "nuclei", "returncode": proc.returncode},
+                })
+            logger.info("run_rce_tests: completed (results=%s)", len(results))
+            return results
+        except Exception:
+            logger.exception("run_rce_tests: direct nuclei subprocess failed; falling back to run_tool")
+
+    # Fall back to the manager (adapter or binary). Call in thread to avoid blocking loop.
     try:
         from modules.tools.manager import run_tool
     except Exception:
@@ -88,33 +172,35 @@ async def run_rce_tests(scope, outdir: str) -> List[Dict[str, Any]]:
                     if result_obj.get(key):
                         vulns = result_obj.get(key)
                         break
-            # JSON-lines in stdout
-            if not vulns and isinstance(result_obj, dict) and isinstance(result_obj.get("stdout"), str):
-                stdout = result_obj.get("stdout", "")
+            # JSON-lines in stdout (str or raw bytes; orjson parses either without
+            # an upfront decode of the whole stream)
+            if not vulns and isinstance(result_obj, dict) and isinstance(result_obj.get("stdout"), (str, bytes)):
+                stdout = result_obj.get("stdout") or (b"" if isinstance(result_obj.get("stdout"), bytes) else "")
                 for ln in stdout.splitlines():
                     if not ln.strip():
                         continue
                     try:
-                        j = json.loads(ln)
+                        j = _json_loads(ln)
                         results.append({
                             "type": "nuclei-detected",
                             "target": j.get("host") or target,
                             "severity": 3,
-                            "evidence": j.get("info", {}).get("name") if isinstance(j.get("info"), dict) else str(j)[:800],
+                            "evidence": j.get("info", {}).get("name") if isinstance(j.get("info"), dict) else _truncate(j, 800),
                             "source": {"tool": "nuclei", "raw": j, "envelope": envelope},
                         })
                     except Exception:
-                        if "cve" in ln.lower() or "vulnerab" in ln.lower():
+                        text = ln.decode("utf-8", "replace") if isinstance(ln, bytes) else ln
+                        if "cve" in text.lower() or "vulnerab" in text.lower():
                             results.append({
                                 "type": "nuclei-inferred",
                                 "target": target,
                                 "severity": 3,
-                                "evidence": ln[:1000],
-                                "source": {"tool": "nuclei", "raw_line": ln, "envelope": envelope},
+                                "evidence": _truncate(text, 1000),
+                                "source": {"tool": "nuclei", "raw_line": text, "envelope": envelope},
                             })
             if isinstance(vulns, list):
                 for v in vulns:
-                    evidence = v.get("info", {}).get("name") if isinstance(v.get("info"), dict) else str(v)[:800]
+                    evidence = v.get("info", {}).get("name") if isinstance(v.get("info"), dict) else _truncate(v, 800)
                     results.append({
                         "type": "nuclei-vuln",
                         "target": v.get("host") or target,
@@ -145,7 +231,7 @@ async def run_rce_tests(scope, outdir: str) -> List[Dict[str, Any]]:
             "type": "nuclei-error",
             "target": target or "<unknown>",
             "severity": 1,
-            "evidence": str(e)[:1000],
+            "evidence": _truncate(e, 1000),
             "source": {"tool": "nuclei", "error": str(e)},
         })
 
@@ -10,18 +10,77 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import random
 import uuid
 import time
 import logging
 from typing import List, Dict, Any, Optional, Set
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+import msgspec
 import redis
 import psutil
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps  # bytes out; redis accepts bytes directly
+except Exception:
+    orjson = None  # type: ignore
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
 logger = logging.getLogger(__name__)
 
+
+class Task(msgspec.Struct):
+    """Scan task envelope; encoded/decoded directly in C by msgspec."""
+    scan_id: str
+    target: str
+    config: Dict[str, Any] = {}
+
+
+class Result(msgspec.Struct):
+    """Scan result envelope reported by worker nodes."""
+    scan_id: str
+    node_id: str
+    target: str
+    status: str
+    duration: float
+    findings: List[Dict[str, Any]] = []
+    error: Optional[str] = None
+
+
+_task_decoder = msgspec.json.Decoder(Task)
+_result_decoder = msgspec.json.Decoder(Result)
+_envelope_encoder = msgspec.json.Encoder()
+
+# Cap on how many values are pushed per pipelined RPUSH; keeps a single
+# pipeline bounded for very large target lists.
+REDIS_BATCH_SIZE = int(os.environ.get("REDIS_BATCH_SIZE", "1024"))
+
+# Node-discovery keys: workers SADD themselves to the set and keep a
+# per-node alive key refreshed; the coordinator prunes members whose
+# alive key has expired.
+NODES_SET = "penai_nodes"
+NODE_ALIVE_PREFIX = "penai_node_alive:"
+NODE_ALIVE_TTL = 15  # seconds
+
+# Per-scan progress hash (total/completed/findings_count/status); counters
+# are bumped with HINCRBY so any coordinator in the consumer group can
+# process results without sharing in-memory state.
+SCAN_HASH_PREFIX = "penai_scan:"
+SCAN_HASH_TTL = 24 * 3600  # seconds
+
+# In-process scan result cache: retries and overlapping batches often
+# re-submit the same (target, config) within a short window.
+SCAN_CACHE_MAX = 2048
+SCAN_CACHE_TTL = 60.0  # seconds
+
+
 class DistributedScanner:
     """Distributed scanner that orchestrates scans across multiple nodes."""
     
@@ -31,49 +90,124 @@ class DistributedScanner:
         self.redis_client = redis.Redis(host=redis_host, port=redis_port, db=redis_db)
         self.task_queue = f"penai_scans:{self.node_id}"
         self.result_queue = "penai_results"
+        self.result_stream = "penai_results_stream"
         self.control_channel = "penai_control"
         self.running = False
         self.max_workers = min(32, (os.cpu_count() or 1) + 4)
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
         self.active_scans: Dict[str, Dict[str, Any]] = {}
         self.scan_progress: Dict[str, Dict[str, Any]] = {}
-        
+        self._blmpop_supported = True
+        self._last_heartbeat = 0.0
+        self._metrics_cache: Dict[str, Any] = {}
+        self._metrics_thread: Optional[threading.Thread] = None
+        self._disk_cache: tuple = (0.0, None)
+        self._scan_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
     def start_worker(self):
         """Start the distributed scanner worker."""
         logger.info(f"Starting distributed scanner worker {self.node_id}")
         self.running = True
         self._subscribe_to_control_channel()
-        
-        # Start processing tasks
+
+        # Start processing tasks: pop a batch per round-trip and fan the tasks
+        # out to the thread pool so the loop immediately fetches the next batch
         while self.running:
             try:
-                # Get task from queue
-                task_data = self.redis_client.blpop(self.task_queue, timeout=1)
-                if task_data:
-                    _, task_json = task_data
-                    task = json.loads(task_json)
-                    self._process_task(task)
+                self._heartbeat()
+                self._poll_control_messages()
+                tasks = self._pop_task_batch(count=64)
+                if not tasks:
+                    # Own queue is drained; try to rebalance from a busy peer
+                    self._steal_task()
+                for task in tasks:
+                    self.executor.submit(self._process_task, task)
             except Exception as e:
                 logger.error(f"Error processing task: {e}")
                 time.sleep(1)
-    
+
+    def _heartbeat(self):
+        """Register this node for coordinator discovery (refreshed every 5s)."""
+        now = time.time()
+        if now - self._last_heartbeat < 5:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.sadd(NODES_SET, self.node_id)
+            pipe.set(f"{NODE_ALIVE_PREFIX}{self.node_id}", "1", ex=NODE_ALIVE_TTL)
+            pipe.execute()
+            self._last_heartbeat = now
+        except Exception as e:
+            logger.error(f"Error sending heartbeat: {e}")
+
+    def _steal_task(self):
+        """Work stealing: move one task from a random peer's queue to ours."""
+        try:
+            peers = [
+                m.decode() if isinstance(m, bytes) else m
+                for m in self.redis_client.smembers(NODES_SET)
+            ]
+            peers = [p for p in peers if p != self.node_id]
+            if not peers:
+                return
+            peer_queue = f"penai_scans:{random.choice(peers)}"
+            stolen = self.redis_client.rpoplpush(peer_queue, self.task_queue)
+            if stolen:
+                logger.debug(f"Stole a task from {peer_queue}")
+        except Exception as e:
+            logger.error(f"Error stealing task: {e}")
+
+    def _pop_task_batch(self, count: int = 64) -> List[Task]:
+        """
+        Pop up to `count` tasks from the queue in a single round-trip.
+
+        Uses BLMPOP (Redis 7 / redis-py 4.4+) so the RTT is amortized across
+        the whole batch; falls back to one-at-a-time BLPOP when either side
+        lacks LMPOP support.
+        """
+        popped = None
+        if self._blmpop_supported:
+            try:
+                popped = self.redis_client.blmpop(
+                    1, 1, self.task_queue, direction="LEFT", count=count
+                )
+            except (AttributeError, redis.ResponseError):
+                logger.info("BLMPOP unavailable; falling back to BLPOP")
+                self._blmpop_supported = False
+        if not self._blmpop_supported:
+            task_data = self.redis_client.blpop(self.task_queue, timeout=1)
+            if task_data:
+                popped = (task_data[0], [task_data[1]])
+        if not popped:
+            return []
+        _, task_jsons = popped
+        return [_task_decoder.decode(task_json) for task_json in task_jsons]
+
     def _subscribe_to_control_channel(self):
-        """Subscribe to control channel for coordination messages."""
-        def listen_for_control_messages():
-            pubsub = self.redis_client.pubsub()
-            pubsub.subscribe(self.control_channel)
-            
-            for message in pubsub.listen():
-                if message['type'] == 'message':
+        """Subscribe to the control channel for coordination messages.
+
+        Messages are drained cooperatively from the worker loop via
+        get_message() rather than a dedicated thread parked forever in
+        pubsub.listen().
+        """
+        self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(self.control_channel)
+
+    def _poll_control_messages(self):
+        """Drain pending control messages without blocking."""
+        try:
+            while True:
+                message = self._pubsub.get_message(timeout=0)
+                if message is None:
+                    break
+                if message.get("type") == "message":
                     try:
-                        control_msg = json.loads(message['data'])
-                        self._handle_control_message(control_msg)
+                        self._handle_control_message(_loads(message["data"]))
                     except Exception as e:
                         logger.error(f"Error handling control message: {e}")
-        
-        control_thread = threading.Thread(target=listen_for_control_messages, daemon=True)
-        control_thread.start()
-    
+        except Exception as e:
+            logger.error(f"Error polling control channel: {e}")
+
     def _handle_control_message(self, message: Dict[str, Any]):
         """Handle control messages from the coordinator."""
         msg_type = message.get("type")
@@ -84,12 +218,12 @@ class DistributedScanner:
                 logger.info(f"Cancelling scan {scan_id}")
                 self.active_scans[scan_id]["cancelled"] = True
     
-    def _process_task(self, task: Dict[str, Any]):
+    def _process_task(self, task: Task):
         """Process a scanning task."""
-        scan_id = task.get("scan_id")
-        target = task.get("target")
-        scan_config = task.get("config", {})
-        
+        scan_id = task.scan_id
+        target = task.target
+        scan_config = task.config
+
         if not scan_id or not target:
             logger.error("Invalid task: missing scan_id or target")
             return
@@ -108,33 +242,68 @@ class DistributedScanner:
             findings = self._run_scan(target, scan_config)
             
             # Report results
-            result = {
-                "scan_id": scan_id,
-                "node_id": self.node_id,
-                "target": target,
-                "findings": findings,
-                "status": "completed",
-                "duration": time.time() - self.active_scans[scan_id]["start_time"]
-            }
-            
+            result = Result(
+                scan_id=scan_id,
+                node_id=self.node_id,
+                target=target,
+                findings=findings,
+                status="completed",
+                duration=time.time() - self.active_scans[scan_id]["start_time"],
+            )
+
             self._report_result(result)
         except Exception as e:
             logger.error(f"Error scanning target {target}: {e}")
-            result = {
-                "scan_id": scan_id,
-                "node_id": self.node_id,
-                "target": target,
-                "error": str(e),
-                "status": "failed",
-                "duration": time.time() - self.active_scans[scan_id]["start_time"]
-            }
+            result = Result(
+                scan_id=scan_id,
+                node_id=self.node_id,
+                target=target,
+                error=str(e),
+                status="failed",
+                duration=time.time() - self.active_scans[scan_id]["start_time"],
+            )
             self._report_result(result)
         finally:
             # Clean up
             if scan_id in self.active_scans:
                 del self.active_scans[scan_id]
     
+    @staticmethod
+    def _config_hash(config: Dict[str, Any]) -> int:
+        if orjson is not None:
+            payload = orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(config, sort_keys=True).encode()
+        return hash(payload)
+
     def _run_scan(self, target: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a scan on a target, short-circuiting recent identical requests.
+
+        Results are cached per (target, config hash) for SCAN_CACHE_TTL
+        seconds. To avoid masking a newly exploitable target, only clean or
+        low-severity results are cached unless config["cache_ok"] is set.
+        """
+        key = (target, self._config_hash(config))
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            ts, findings = cached
+            if time.time() - ts < SCAN_CACHE_TTL:
+                self._scan_cache.move_to_end(key)
+                return list(findings)
+            del self._scan_cache[key]
+
+        findings = self._run_scan_uncached(target, config)
+
+        cacheable = config.get("cache_ok") or all(
+            f.get("severity", 0) <= 2 for f in findings
+        )
+        if cacheable:
+            self._scan_cache[key] = (time.time(), list(findings))
+            if len(self._scan_cache) > SCAN_CACHE_MAX:
+                self._scan_cache.popitem(last=False)
+        return findings
+
+    def _run_scan_uncached(self, target: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Run the actual security scan on a target."""
         # This would integrate with the existing scanning modules
         # For now, we'll simulate a scan
@@ -159,33 +328,42 @@ class DistributedScanner:
         
         return findings
     
-    def _report_result(self, result: Dict[str, Any]):
-        """Report scan result to the result queue."""
+    def _report_result(self, result: Result):
+        """Report scan result to the results stream (legacy list as fallback)."""
+        result_json = _envelope_encoder.encode(result)
         try:
-            result_json = json.dumps(result)
-            self.redis_client.rpush(self.result_queue, result_json)
-            logger.info(f"Reported result for scan {result['scan_id']}")
-        except Exception as e:
-            logger.error(f"Error reporting result: {e}")
+            # Capped stream so unconsumed results cannot grow unbounded
+            self.redis_client.xadd(
+                self.result_stream, {"r": result_json}, maxlen=100_000, approximate=True
+            )
+            logger.info(f"Reported result for scan {result.scan_id}")
+        except Exception:
+            # Older Redis without streams: fall back to the plain result list
+            try:
+                self.redis_client.rpush(self.result_queue, result_json)
+                logger.info(f"Reported result for scan {result.scan_id} (list fallback)")
+            except Exception as e:
+                logger.error(f"Error reporting result: {e}")
     
     def submit_scan_batch(self, targets: List[str], config: Dict[str, Any]) -> str:
         """Submit a batch of targets for distributed scanning."""
         scan_id = str(uuid.uuid4())
-        
-        # Submit each target as a separate task
-        for target in targets:
-            task = {
-                "scan_id": scan_id,
-                "target": target,
-                "config": config
-            }
-            
-            try:
-                task_json = json.dumps(task)
-                self.redis_client.rpush(self.task_queue, task_json)
-            except Exception as e:
-                logger.error(f"Error submitting task for {target}: {e}")
-        
+
+        # Serialize all tasks up front, then push them in one pipelined
+        # round-trip instead of one RPUSH (and one RTT) per target
+        task_jsons = [
+            _envelope_encoder.encode(Task(scan_id=scan_id, target=target, config=config))
+            for target in targets
+        ]
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for i in range(0, len(task_jsons), REDIS_BATCH_SIZE):
+                pipe.rpush(self.task_queue, *task_jsons[i:i + REDIS_BATCH_SIZE])
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error submitting scan batch {scan_id}: {e}")
+
         logger.info(f"Submitted scan batch {scan_id} with {len(targets)} targets")
         return scan_id
     
@@ -226,18 +404,55 @@ class DistributedScanner:
         }
         
         try:
-            self.redis_client.publish(self.control_channel, json.dumps(cancel_msg))
+            self.redis_client.publish(self.control_channel, _dumps(cancel_msg))
             logger.info(f"Sent cancel message for scan {scan_id}")
         except Exception as e:
             logger.error(f"Error sending cancel message: {e}")
     
+    def _start_metrics_sampler(self):
+        """Start the background thread that samples psutil every 5 seconds."""
+        if self._metrics_thread is not None:
+            return
+
+        def sample():
+            psutil.cpu_percent(interval=None)  # prime the delta baseline
+            while True:
+                try:
+                    self._metrics_cache = {
+                        "cpu_percent": psutil.cpu_percent(interval=None),
+                        "memory": psutil.virtual_memory(),
+                        "sampled_at": time.time(),
+                    }
+                except Exception as e:
+                    logger.error(f"Error sampling system metrics: {e}")
+                time.sleep(5)
+
+        self._metrics_thread = threading.Thread(target=sample, daemon=True)
+        self._metrics_thread.start()
+
+    def _disk_usage_cached(self):
+        """disk_usage('/') memoized for 30 s; it changes slowly and stats a mount."""
+        ts, usage = self._disk_cache
+        now = time.time()
+        if usage is None or now - ts > 30:
+            usage = psutil.disk_usage('/')
+            self._disk_cache = (now, usage)
+        return usage
+
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get system metrics for resource monitoring."""
+        """Get system metrics for resource monitoring.
+
+        Reads come from a background sampler cache, so frequent dashboard
+        polls never block the caller (the old cpu_percent(interval=1) call
+        stalled the worker for a full second per poll).
+        """
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
+            self._start_metrics_sampler()
+            sample = self._metrics_cache
+            cpu_percent = sample.get("cpu_percent", psutil.cpu_percent(interval=None))
+            memory = sample.get("memory") or psutil.virtual_memory()
+            disk = self._disk_usage_cached()
+
             return {
                 "node_id": self.node_id,
                 "timestamp": time.time(),
@@ -259,63 +474,133 @@ class DistributedScanCoordinator:
     def __init__(self, redis_host: str = "localhost", redis_port: int = 6379, redis_db: int = 0):
         self.redis_client = redis.Redis(host=redis_host, port=redis_port, db=redis_db)
         self.result_queue = "penai_results"
+        self.result_stream = "penai_results_stream"
+        self.consumer_group = "coordinators"
+        self.coordinator_id = str(uuid.uuid4())
         self.active_scans: Dict[str, Dict[str, Any]] = {}
-        self.scan_results: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        
+        # Running per-scan aggregates plus a capped ring of raw results for
+        # audit; raw results are not retained unboundedly
+        self.scan_summary: Dict[str, Dict[str, Any]] = {}
+        self.recent_results: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+
+    def _ensure_consumer_group(self):
+        """Create the results consumer group; a pre-existing group is fine."""
+        try:
+            self.redis_client.xgroup_create(
+                self.result_stream, self.consumer_group, id="0", mkstream=True
+            )
+        except redis.ResponseError:
+            pass  # BUSYGROUP: another coordinator already created it
+
     def start_coordinator(self):
-        """Start the scan coordinator to collect results."""
+        """Start the scan coordinator to collect results.
+
+        Reads result batches from a stream via XREADGROUP, so several
+        coordinators can share the consumer group and unacked entries
+        survive a coordinator crash (at-least-once delivery).
+        """
         logger.info("Starting distributed scan coordinator")
-        
+        self._ensure_consumer_group()
+
         while True:
             try:
-                # Get results from queue
-                result_data = self.redis_client.blpop(self.result_queue, timeout=1)
-                if result_data:
-                    _, result_json = result_data
-                    result = json.loads(result_json)
-                    self._process_result(result)
+                entries = self.redis_client.xreadgroup(
+                    self.consumer_group,
+                    self.coordinator_id,
+                    {self.result_stream: ">"},
+                    count=128,
+                    block=1000,
+                )
+                if not entries:
+                    continue
+                ack_ids = []
+                for _stream, messages in entries:
+                    for msg_id, fields in messages:
+                        result_json = fields.get(b"r") or fields.get("r")
+                        if result_json:
+                            self._process_result(_result_decoder.decode(result_json))
+                        ack_ids.append(msg_id)
+                if ack_ids:
+                    self.redis_client.xack(self.result_stream, self.consumer_group, *ack_ids)
             except Exception as e:
                 logger.error(f"Error processing result: {e}")
                 time.sleep(1)
-    
-    def _process_result(self, result: Dict[str, Any]):
+
+    def _process_result(self, result: Result):
         """Process a scan result from a worker node."""
-        scan_id = result.get("scan_id")
+        scan_id = result.scan_id
         if not scan_id:
             return
-        
+
         logger.info(f"Processing result for scan {scan_id}")
-        self.scan_results[scan_id].append(result)
-        
-        # Update scan status
+
+        # Fold the result into running counters and keep only a bounded ring
+        # of raw results, so coordinator RSS stays flat on long runs
+        summary = self.scan_summary.setdefault(scan_id, {
+            "n_results": 0,
+            "total_findings": 0,
+            "by_severity": Counter(),
+            "by_node": Counter(),
+        })
+        summary["n_results"] += 1
+        summary["total_findings"] += len(result.findings)
+        summary["by_node"][result.node_id] += 1
+        for finding in result.findings:
+            summary["by_severity"][finding.get("severity", 0)] += 1
+        self.recent_results[scan_id].append(msgspec.structs.asdict(result))
+
         if scan_id in self.active_scans:
-            self.active_scans[scan_id]["completed_targets"] += 1
-            self.active_scans[scan_id]["findings"].extend(result.get("findings", []))
-            
-            # Check if scan is complete
-            total_targets = self.active_scans[scan_id]["total_targets"]
-            completed_targets = self.active_scans[scan_id]["completed_targets"]
-            
-            if completed_targets >= total_targets:
-                self.active_scans[scan_id]["status"] = "completed"
-                logger.info(f"Scan {scan_id} completed with {len(self.active_scans[scan_id]['findings'])} findings")
+            self.active_scans[scan_id]["findings"].extend(result.findings)
+
+        # Progress lives in a Redis hash, not in this process: HINCRBY is
+        # atomic, so multiple coordinators sharing the consumer group can
+        # count completions without coordination, and progress survives a
+        # coordinator restart.
+        try:
+            scan_key = f"{SCAN_HASH_PREFIX}{scan_id}"
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hincrby(scan_key, "completed", 1)
+            pipe.hincrby(scan_key, "findings_count", len(result.findings))
+            pipe.hget(scan_key, "total")
+            completed, findings_count, total = pipe.execute()
+            if total is not None and completed >= int(total):
+                self.redis_client.hset(scan_key, "status", "completed")
+                if scan_id in self.active_scans:
+                    self.active_scans[scan_id]["status"] = "completed"
+                logger.info(f"Scan {scan_id} completed with {findings_count} findings")
+        except Exception as e:
+            logger.error(f"Error updating scan progress for {scan_id}: {e}")
     
     def initiate_distributed_scan(self, targets: List[str], config: Dict[str, Any]) -> str:
         """Initiate a distributed scan across all available nodes."""
         scan_id = str(uuid.uuid4())
         
-        # Register the scan
+        # Register the scan; progress counters live in a Redis hash so they
+        # are shared across coordinators and survive restarts
         self.active_scans[scan_id] = {
             "scan_id": scan_id,
             "targets": targets,
             "config": config,
             "total_targets": len(targets),
-            "completed_targets": 0,
             "findings": [],
             "start_time": time.time(),
             "status": "running"
         }
-        
+        try:
+            scan_key = f"{SCAN_HASH_PREFIX}{scan_id}"
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(scan_key, mapping={
+                "total": len(targets),
+                "completed": 0,
+                "findings_count": 0,
+                "status": "running",
+            })
+            pipe.expire(scan_key, SCAN_HASH_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error registering scan {scan_id} in redis: {e}")
+
+
         # Distribute targets across nodes
         # In a real implementation, we would discover available nodes
         # For now, we'll just submit to the default queue
@@ -326,23 +611,37 @@ class DistributedScanCoordinator:
     
     def _distribute_targets(self, scan_id: str, targets: List[str], config: Dict[str, Any]):
         """Distribute targets across available worker nodes."""
-        # Simple round-robin distribution for now
-        # In a real implementation, we would consider node capacity and load
+        # Round-robin across the live per-node queues discovered via the
+        # heartbeat set; the fixed hash-bucket queues remain only as a
+        # fallback when no worker has registered yet.
+        nodes = self._discover_nodes()
+        if nodes:
+            queues = [f"penai_scans:{node_id}" for node_id in nodes]
+        else:
+            queues = [f"penai_scans:queue_{i}" for i in range(5)]
+
+        # Encode the shared scan_id/config exactly once; per-target envelopes
+        # are then cheap byte splices instead of N re-encodings of the same
+        # (potentially large) config. The placeholder target field precedes
+        # the config in the struct layout, so the first match is always it.
+        template = _envelope_encoder.encode(Task(scan_id=scan_id, target="", config=config))
+        head, tail = template.split(b'"target":""', 1)
+
+        # Group tasks per queue, then push everything in one pipelined batch
+        # instead of one RPUSH round-trip per target
+        per_queue: Dict[str, List[bytes]] = defaultdict(list)
         for i, target in enumerate(targets):
-            task = {
-                "scan_id": scan_id,
-                "target": target,
-                "config": config
-            }
-            
-            try:
-                # Distribute to different queues based on hash
-                queue_suffix = i % 5  # Distribute across 5 queues
-                task_queue = f"penai_scans:queue_{queue_suffix}"
-                task_json = json.dumps(task)
-                self.redis_client.rpush(task_queue, task_json)
-            except Exception as e:
-                logger.error(f"Error distributing task for {target}: {e}")
+            body = head + b'"target":' + _envelope_encoder.encode(target) + tail
+            per_queue[queues[i % len(queues)]].append(body)
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for task_queue, task_jsons in per_queue.items():
+                for j in range(0, len(task_jsons), REDIS_BATCH_SIZE):
+                    pipe.rpush(task_queue, *task_jsons[j:j + REDIS_BATCH_SIZE])
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error distributing tasks for scan {scan_id}: {e}")
     
     def get_scan_results(self, scan_id: str) -> Dict[str, Any]:
         """Get results for a distributed scan."""
@@ -350,40 +649,69 @@ class DistributedScanCoordinator:
             return {"error": "Scan not found"}
         
         scan_info = self.active_scans[scan_id]
+        status = scan_info["status"]
+        completed_targets = 0
+        try:
+            progress = self.redis_client.hgetall(f"{SCAN_HASH_PREFIX}{scan_id}")
+            progress = {
+                (k.decode() if isinstance(k, bytes) else k):
+                (v.decode() if isinstance(v, bytes) else v)
+                for k, v in progress.items()
+            }
+            completed_targets = int(progress.get("completed", 0))
+            status = progress.get("status", status)
+        except Exception as e:
+            logger.error(f"Error reading scan progress for {scan_id}: {e}")
         return {
             "scan_id": scan_id,
-            "status": scan_info["status"],
+            "status": status,
             "total_targets": scan_info["total_targets"],
-            "completed_targets": scan_info["completed_targets"],
+            "completed_targets": completed_targets,
             "findings": scan_info["findings"],
-            "duration": time.time() - scan_info["start_time"] if scan_info["status"] == "completed" else None,
-            "results_by_node": self.scan_results[scan_id]
+            "duration": time.time() - scan_info["start_time"] if status == "completed" else None,
+            "summary": self.scan_summary.get(scan_id, {}),
+            "results_by_node": list(self.recent_results.get(scan_id, ()))
         }
     
     def get_cluster_status(self) -> Dict[str, Any]:
         """Get the status of the entire scanning cluster."""
         try:
-            # Get queue lengths
+            nodes = self._discover_nodes()
+
+            # Get queue lengths for per-node queues plus the legacy buckets
             queue_info = {}
-            for i in range(5):
-                queue_name = f"penai_scans:queue_{i}"
+            queue_names = [f"penai_scans:{node_id}" for node_id in nodes]
+            queue_names += [f"penai_scans:queue_{i}" for i in range(5)]
+            for queue_name in queue_names:
                 queue_info[queue_name] = self.redis_client.llen(queue_name)
-            
+
             return {
                 "active_scans": len(self.active_scans),
                 "pending_results": self.redis_client.llen(self.result_queue),
                 "task_queues": queue_info,
-                "nodes": self._discover_nodes()
+                "nodes": nodes
             }
         except Exception as e:
             logger.error(f"Error getting cluster status: {e}")
             return {}
-    
+
     def _discover_nodes(self) -> List[str]:
-        """Discover available worker nodes."""
-        # In a real implementation, we would discover nodes through Redis
-        # For now, we'll return a static list
-        return ["node_1", "node_2", "node_3"]
+        """Discover live worker nodes via the heartbeat set, pruning dead ones."""
+        try:
+            members = [
+                m.decode() if isinstance(m, bytes) else m
+                for m in self.redis_client.smembers(NODES_SET)
+            ]
+            live = []
+            for node_id in members:
+                if self.redis_client.exists(f"{NODE_ALIVE_PREFIX}{node_id}"):
+                    live.append(node_id)
+                else:
+                    self.redis_client.srem(NODES_SET, node_id)
+            return live
+        except Exception as e:
+            logger.error(f"Error discovering nodes: {e}")
+            return []
 
 # Global instances
 _distributed_scanner: Optional[DistributedScanner] = None
@@ -1,46 +1,70 @@
 # modules/fingerprint.py
+import asyncio
 import json, os, re
 from urllib.parse import urlparse
 import httpx
 from modules.utils import resolve_working_url
 
-# COMMON_HEADERS = ["server","x-powered-by","via","x-cms","set-cookie"]
+COMMON_HEADERS = ["server","x-powered-by","via","x-cms","set-cookie"]
 
-async def fingerprint(scope, outdir):
+# One translate() pass lowercases the raw bytes; no decoded str copy needed
+_LOWER = bytes(range(256)).lower()
+
+# Single multi-pattern scan for CMS markers instead of one `in` sweep per
+# marker; first hit in the body wins
+_CMS_RE = re.compile(rb"wp-content|wordpress|django|joomla")
+_CMS_TAG = {b"wp-content": "wordpress", b"wordpress": "wordpress",
+            b"django": "django", b"joomla": "joomla"}
+
+# version-like regex in headers/body, compiled once at import
+_VER_RE = re.compile(rb"(php|apache|nginx|wordpress)[/ ]?([0-9.]+)")
+
+# CMS/version markers sit in the first part of the page; cap how much body
+# is pulled per target instead of buffering arbitrarily large responses
+_BODY_CAP = 256 * 1024
+
+async def fingerprint(scope, outdir, max_concurrency=50):
     os.makedirs(outdir, exist_ok=True)
-    findings = {}
-    for t in scope.targets:
-        try:
-            working = await resolve_working_url(t, timeout=6.0)
-        except Exception as e:
-            findings[t] = {"error": repr(e)}
-            continue
-        try:
-            async with httpx.AsyncClient(timeout=10, headers={"User-Agent":"PenAI-Min/1.0"}) as client:
-                r = await client.get(working)
-                headers = dict(r.headers)
-                info = {"used_url": working, "status": r.status_code, "headers": {}}
-                for h in COMMON_HEADERS:
-                    if h in headers:
-                        info["headers"][h] = headers[h]
-                # simple body fingerprint: look for common CMS markers
-                body = (r.text or "").lower()
-                cms = None
-                if "wp-content" in body or "wordpress" in body:
-                    cms = "wordpress"
-                elif "django" in body:
-                    cms = "django"
-                elif "joomla" in body:
-                    cms = "joomla"
-                if cms:
-                    info["cms"] = cms
-                # version-like regex in headers/body
-                vers = re.findall(r"(php|apache|nginx|wordpress)[/ ]?([0-9\.]+)", (r.headers.get("server","")+" "+body))
-                if vers:
-                    info["versions"] = vers[:3]
-                findings[t] = info
-        except Exception as e:
-            findings[t] = {"error": repr(e), "used_url": working}
+    # One shared client keeps connections warm across targets; the semaphore
+    # caps fan-out for very large scopes
+    sem = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+    async with httpx.AsyncClient(timeout=10, headers={"User-Agent":"PenAI-Min/1.0"}, limits=limits) as client:
+        async def _one(t):
+            async with sem:
+                try:
+                    working = await resolve_working_url(t, timeout=6.0)
+                except Exception as e:
+                    return t, {"error": repr(e)}
+                try:
+                    # stream the body and stop at the cap
+                    buf = bytearray()
+                    async with client.stream("GET", working) as r:
+                        headers = dict(r.headers)
+                        info = {"used_url": working, "status": r.status_code, "headers": {}}
+                        for h in COMMON_HEADERS:
+                            if h in headers:
+                                info["headers"][h] = headers[h]
+                        async for chunk in r.aiter_bytes():
+                            buf.extend(chunk)
+                            if len(buf) >= _BODY_CAP:
+                                break
+                    # simple body fingerprint: look for common CMS markers
+                    # (raw bytes, lowercased in a single translate pass)
+                    body = bytes(buf[:_BODY_CAP]).translate(_LOWER)
+                    m = _CMS_RE.search(body)
+                    if m:
+                        info["cms"] = _CMS_TAG[m.group(0)]
+                    haystack = r.headers.get("server","").lower().encode() + b" " + body
+                    vers = _VER_RE.findall(haystack)
+                    if vers:
+                        info["versions"] = [(name.decode(), ver.decode()) for name, ver in vers[:3]]
+                    return t, info
+                except Exception as e:
+                    return t, {"error": repr(e), "used_url": working}
+
+        findings = dict(await asyncio.gather(*[_one(t) for t in scope.targets]))
     with open(f"{outdir}/fingerprint.json","w") as f:
         json.dump(findings, f, indent=2)
     return findings
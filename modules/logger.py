@@ -1,17 +1,41 @@
+import atexit
 import logging, os, sys
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+
+# Listeners per logger name; kept alive for the process and stopped (which
+# flushes) at exit.
+_listeners = {}
+
+def _shutdown():
+    for listener in _listeners.values():
+        if listener._thread is not None:  # stop() is not idempotent
+            listener.stop()
+
+atexit.register(_shutdown)
 
 def init_logger(outdir, name="penai"):
     os.makedirs(outdir, exist_ok=True)
     logpath = f"{outdir}/logs/agent.log"
-    fh = logging.FileHandler(logpath)
-    sh = logging.StreamHandler(sys.stdout)
-    fmt = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    fh.setFormatter(fmt)
-    sh.setFormatter(fmt)
+    os.makedirs(os.path.dirname(logpath), exist_ok=True)
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     # prevent duplicate handlers
-    if not any(isinstance(h, logging.FileHandler) and h.baseFilename==os.path.abspath(logpath) for h in logger.handlers):
-        logger.addHandler(fh)
-        logger.addHandler(sh)
+    if any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return logger
+    fmt = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    # delay=True: the file is only opened on first emit, and writes are
+    # batched through a MemoryHandler (WARNING and above flush immediately)
+    fh = logging.FileHandler(logpath, delay=True)
+    fh.setFormatter(fmt)
+    buffered_fh = MemoryHandler(capacity=256, flushLevel=logging.WARNING, target=fh)
+    sh = logging.StreamHandler(sys.stdout)
+    sh.setFormatter(fmt)
+    # Log calls only enqueue the record; the listener thread does the actual
+    # file/stream I/O so hot loops never block on write(2)
+    q = queue.Queue(-1)
+    logger.addHandler(QueueHandler(q))
+    listener = QueueListener(q, buffered_fh, sh, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
     return logger
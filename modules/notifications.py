@@ -4,22 +4,49 @@ Notification system for security testing framework.
 Supports Slack and Microsoft Teams notifications.
 """
 
+import atexit
+import functools
 import os
 import json
-import requests
+import queue
+import httpx
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+
+@functools.lru_cache(maxsize=128)
+def _read_json_cached(path: str, mtime_ns: int, size: int):
+    """Parse a JSON file once per (path, mtime, size); repeat notifications
+    for the same run_dir hit the cache instead of re-reading the file."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Small pool so Slack and Teams posts for one scan fire in parallel
+_post_executor = ThreadPoolExecutor(max_workers=2)
+
 class NotificationManager:
     """Manages notifications to various platforms."""
-    
+
     def __init__(self):
         self.slack_webhook_url = os.environ.get("SLACK_WEBHOOK_URL")
         self.teams_webhook_url = os.environ.get("TEAMS_WEBHOOK_URL")
-        
+        # Pooled client: webhook posts reuse warm TCP/TLS connections instead
+        # of paying the handshake per notification; transient failures retry
+        # at the transport level
+        self._client = httpx.Client(timeout=30, transport=httpx.HTTPTransport(retries=2))
+        atexit.register(self._client.close)
+
     def send_slack_notification(self, message: str, attachments: Optional[Dict[str, Any]] = None) -> bool:
         """
         Send a notification to Slack.
@@ -41,10 +68,9 @@ class NotificationManager:
         }
         
         try:
-            response = requests.post(
+            response = self._client.post(
                 self.slack_webhook_url,
-                json=payload,
-                timeout=30
+                json=payload
             )
             response.raise_for_status()
             logger.info("Slack notification sent successfully")
@@ -83,10 +109,9 @@ class NotificationManager:
         }
         
         try:
-            response = requests.post(
+            response = self._client.post(
                 self.teams_webhook_url,
-                json=payload,
-                timeout=30
+                json=payload
             )
             response.raise_for_status()
             logger.info("Teams notification sent successfully")
@@ -109,19 +134,27 @@ class NotificationManager:
         scan_metadata = {}
         if meta_file.exists():
             try:
-                with open(meta_file, "r") as f:
-                    scan_metadata = json.load(f)
+                st = os.stat(meta_file)
+                scan_metadata = _read_json_cached(str(meta_file), st.st_mtime_ns, st.st_size)
             except Exception as e:
                 logger.warning(f"Failed to read scan metadata: {e}")
-        
-        # Count findings if available
+
+        # Count findings if available. A sibling findings.count file (written
+        # alongside findings.json) turns the count into an O(1) read; only
+        # fall back to parsing the full JSON when it is absent.
         findings_count = 0
         findings_file = Path(run_dir) / "findings.json"
-        if findings_file.exists():
+        count_file = Path(run_dir) / "findings.count"
+        if count_file.exists():
             try:
-                with open(findings_file, "r") as f:
-                    findings = json.load(f)
-                    findings_count = len(findings) if isinstance(findings, list) else 0
+                findings_count = int(count_file.read_text().strip() or 0)
+            except Exception as e:
+                logger.warning(f"Failed to read findings count: {e}")
+        elif findings_file.exists():
+            try:
+                st = os.stat(findings_file)
+                findings = _read_json_cached(str(findings_file), st.st_mtime_ns, st.st_size)
+                findings_count = len(findings) if isinstance(findings, list) else 0
             except Exception as e:
                 logger.warning(f"Failed to read findings: {e}")
         
@@ -137,12 +170,71 @@ class NotificationManager:
             message = f"❌ Security scan failed for {target}\n"
             message += "Please check the logs for more details."
         
-        # Send notifications
-        self.send_slack_notification(message)
-        self.send_teams_notification(message, "Security Scan Results")
+        # Send notifications (both webhooks in parallel)
+        slack_future = _post_executor.submit(self.send_slack_notification, message)
+        teams_future = _post_executor.submit(
+            self.send_teams_notification, message, "Security Scan Results"
+        )
+        slack_future.result()
+        teams_future.result()
+
+class NotificationBatcher:
+    """
+    Coalesces notifications arriving close together into one Slack post.
+
+    Messages queued within the batching window are flushed as a single
+    message with one attachment per entry (Slack caps attachments at 100),
+    so a burst of scan completions costs one webhook round-trip instead of
+    one per scan.
+    """
+
+    def __init__(self, manager: "NotificationManager", window: float = 0.5, max_batch: int = 100):
+        self.manager = manager
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def notify(self, message: str) -> None:
+        """Queue a message; the background thread batches and sends it."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put(message)
+
+    def _drain_batch(self) -> List[str]:
+        """Block for the first message, then collect the rest of the window."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain_batch()
+            try:
+                if len(batch) == 1:
+                    self.manager.send_slack_notification(batch[0])
+                else:
+                    self.manager.send_slack_notification(
+                        f"{len(batch)} notifications",
+                        [{"text": message} for message in batch]
+                    )
+            except Exception as e:
+                logger.error(f"Failed to send batched notification: {e}")
 
 # Global instance
 notification_manager = NotificationManager()
+notification_batcher = NotificationBatcher(notification_manager)
 
 def send_slack_notification(message: str, attachments: Optional[Dict[str, Any]] = None) -> bool:
     """Send a Slack notification."""
@@ -7,6 +7,28 @@ will try several function names. This stub provides a simple normalizer.
 Returns list of normalized findings:
   { type, target, severity, evidence, source }
 """
+import re
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+# One case-insensitive bytes-level pass instead of lowercasing the whole
+# stdout twice; matching on bytes skips the decoded copy entirely
+_MARK_RE = re.compile(rb"vulnerable|cve", re.I)
+
+
+def _evidence(p, n=500):
+    """Bounded stringification; avoids a full repr of a large dict."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(p)[:n].decode("utf-8", "replace")
+        except Exception:
+            pass
+    return str(p)[:n]
+
+
 def parse_masscan_output(envelope, run_dir=None):
     out = []
     # prefer adapter-provided parsed_findings
@@ -17,7 +39,7 @@ def parse_masscan_output(envelope, run_dir=None):
                 "type": p.get("type") or "masscan-vuln",
                 "target": p.get("target") or envelope.get("result",{}).get("target") or "<unknown>",
                 "severity": int(p.get("severity") or 3),
-                "evidence": p.get("evidence") or str(p)[:500],
+                "evidence": p.get("evidence") or _evidence(p),
                 "source": {"tool": "masscan", "raw": p}
             })
         return out
@@ -25,12 +47,13 @@ def parse_masscan_output(envelope, run_dir=None):
     # fallback: look at stdout text
     res = envelope.get("result") or envelope
     stdout = (res.get("stdout") if isinstance(res, dict) else None) or ""
-    if isinstance(stdout, str) and ("vulnerable" in stdout.lower() or "cve" in stdout.lower()):
+    sb = stdout.encode("utf-8", "ignore") if isinstance(stdout, str) else stdout
+    if sb and _MARK_RE.search(sb):
         out.append({
             "type": "masscan-inferred",
             "target": envelope.get("result",{}).get("target") or "<unknown>",
             "severity": 3,
-            "evidence": stdout[:1000],
+            "evidence": sb[:1000].decode("utf-8", "replace"),
             "source": {"tool": "masscan", "raw": stdout},
         })
     return out
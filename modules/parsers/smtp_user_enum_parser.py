@@ -1,6 +1,27 @@
 
 #!/usr/bin/env python3
 """Parser for smtp-user-enum outputs (normalized)."""
+import re
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+# One case-insensitive bytes-level pass instead of lowercasing the whole
+# stdout per marker; matching on bytes skips the decoded copy entirely
+_MARK_RE = re.compile(rb"vulnerable|cve|username", re.I)
+
+
+def _evidence(p, n=500):
+    """Bounded stringification; avoids a full repr of a large dict."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(p)[:n].decode("utf-8", "replace")
+        except Exception:
+            pass
+    return str(p)[:n]
+
 
 def parse_smtp_user_enum_output(envelope, run_dir=None):
     out = []
@@ -11,19 +32,20 @@ def parse_smtp_user_enum_output(envelope, run_dir=None):
                 "type": p.get("type") or "smtp-user-enum-vuln",
                 "target": p.get("target") or envelope.get("result", {}).get("target") or "<unknown>",
                 "severity": int(p.get("severity") or 3),
-                "evidence": p.get("evidence") or str(p)[:500],
+                "evidence": p.get("evidence") or _evidence(p),
                 "source": {"tool": "smtp-user-enum", "raw": p}
             })
         return out
 
     res = envelope.get("result") or envelope
     stdout = (res.get("stdout") if isinstance(res, dict) else "") or ""
-    if isinstance(stdout, str) and ("vulnerable" in stdout.lower() or "cve" in stdout.lower() or "username" in stdout.lower()):
+    sb = stdout.encode("utf-8", "ignore") if isinstance(stdout, str) else stdout
+    if sb and _MARK_RE.search(sb):
         out.append({
             "type": "smtp-user-enum-inferred",
             "target": envelope.get("result", {}).get("target") or "<unknown>",
             "severity": 3,
-            "evidence": stdout[:1000],
+            "evidence": sb[:1000].decode("utf-8", "replace"),
             "source": {"tool": "smtp-user-enum", "raw": stdout},
         })
     return out
@@ -7,6 +7,13 @@ will try several function names. This stub provides a simple normalizer.
 Returns list of normalized findings:
   { type, target, severity, evidence, source }
 """
+import re
+
+# One case-insensitive bytes-level pass instead of lowercasing the whole
+# stdout per marker; matching on bytes skips the decoded copy entirely
+_WW_RE = re.compile(rb"vulnerable|cve", re.I)
+
+
 def parse_whatweb_output(envelope, run_dir=None):
     out = []
     # prefer adapter-provided parsed_findings
@@ -25,12 +32,13 @@ def parse_whatweb_output(envelope, run_dir=None):
     # fallback: look at stdout text
     res = envelope.get("result") or envelope
     stdout = (res.get("stdout") if isinstance(res, dict) else None) or ""
-    if isinstance(stdout, str) and ("vulnerable" in stdout.lower() or "cve" in stdout.lower()):
+    sb = stdout.encode("utf-8", "ignore") if isinstance(stdout, str) else stdout
+    if sb and _WW_RE.search(sb):
         out.append({
             "type": "whatweb-inferred",
             "target": envelope.get("result",{}).get("target") or "<unknown>",
             "severity": 3,
-            "evidence": stdout[:1000],
+            "evidence": sb[:1000].decode("utf-8", "replace"),
             "source": {"tool": "whatweb", "raw": stdout},
         })
     return out
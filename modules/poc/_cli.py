@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Shared argparse CLI for the poc scripts.
+
+Every script here takes a run directory; the mapper-backed ones add the
+same three tuning flags. One parser factory replaces the hand-rolled
+sys.argv scans that each script had grown.
+"""
+import argparse
+
+
+def build_parser(description=None, mapper_flags=False):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("run_dir", help="runs/<domain>/<run-id> directory")
+    if mapper_flags:
+        parser.add_argument("--multi", action="store_true",
+                            help="attach to every finding above the threshold, not just the best")
+        parser.add_argument("--threshold", type=float, default=0.5,
+                            help="minimum match score to attach a PoC")
+        parser.add_argument("--dump-top", type=int, default=0, dest="dump_top",
+                            help="record the top-N candidate scores per PoC in diagnostics")
+    return parser
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Shared JSON I/O for the poc modules.
+
+Uses orjson when installed (Rust (de)serializer, several times faster on the
+large pocs/final_report files these scripts shuffle around) and falls back to
+stdlib json otherwise.
+"""
+import json
+import mmap
+import os
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+# Reports below this size are read straight into memory; mmap setup costs
+# more than it saves there
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def load_json(path):
+    """Parse a JSON file; path may be a str or Path.
+
+    Large files are parsed directly off an mmap'd buffer, skipping the
+    intermediate bytes copy of the whole file.
+    """
+    with open(path, "rb") as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                with memoryview(mm) as view:  # orjson takes a buffer, not the mmap itself
+                    return orjson.loads(view)
+            finally:
+                mm.close()
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json_stream(path, items):
+    """Stream a JSON array to disk one element at a time.
+
+    Peak memory stays at one serialized element instead of the whole
+    array's buffer; use for large machine-consumed lists like pocs.json.
+    """
+    if orjson is None:
+        write_json(path, list(items), pretty=False)
+        return
+    with open(path, "wb") as f:
+        f.write(b"[")
+        for i, item in enumerate(items):
+            if i:
+                f.write(b",")
+            f.write(orjson.dumps(item))
+        f.write(b"]")
+
+
+def write_json(path, obj, pretty=True):
+    """Write obj as JSON; path may be a str or Path.
+
+    pretty=False skips indentation — use it for machine-consumed artifacts
+    (pocs.json, pocs_compact.json, final_report_with_pocs*.json), where the
+    indented form only costs serialization time and file size.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2 if pretty else None, ensure_ascii=False)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Memoized URL normalization shared by the poc modules.
+
+The same handful of URLs flows through generate_pocs, attach_pocs and
+curate_findings, each of which re-derived stripped/split forms per call;
+the cache makes every repeat a dict hit.
+"""
+import functools
+from urllib.parse import urlparse
+
+
+@functools.lru_cache(maxsize=8192)
+def norm_url(u):
+    """Return (normalized, host, path, first_param) for a URL string.
+
+    normalized is the input stripped of whitespace and trailing slashes;
+    first_param is the name of the first query parameter, if any.
+    """
+    normalized = u.strip().rstrip("/")
+    parsed = urlparse(normalized)
+    first_param = None
+    if parsed.query and "=" in parsed.query:
+        first_param = parsed.query.split("=", 1)[0]
+    return normalized, parsed.netloc, parsed.path, first_param
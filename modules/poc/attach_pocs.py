@@ -9,7 +9,17 @@ import json
 import os
 import sys
 from typing import Any, Dict, List
-from modules.poc.map_pocs_to_findings import map_pocs, find_pocs_file, find_report_file, load_json, write_json
+try:
+    from modules.poc.map_pocs_to_findings import (map_pocs, find_pocs_file, find_report_file,
+                                                  load_json, write_json, scan_reports_dir)
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from modules.poc.map_pocs_to_findings import (map_pocs, find_pocs_file, find_report_file,
+                                                  load_json, write_json, scan_reports_dir)
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
 
 
 def normalize_pocs_input(pocs_raw: Any) -> List[Dict[str, Any]]:
@@ -64,12 +74,12 @@ def attach_pocs_to_report(run_dir: str,
         return summary
     except Exception:
         # --- Fallback: naive attach ---
-        final_candidates = [os.path.join(reports_dir, "final_report_with_pocs.json"),
-                            os.path.join(reports_dir, "final_report.json")]
+        entries = scan_reports_dir(reports_dir)
         final = None
-        for c in final_candidates:
-            if os.path.isfile(c):
-                final = load_json(c)
+        for name in ("final_report_with_pocs.json", "final_report.json"):
+            path = entries.get(name)
+            if path:
+                final = load_json(path)
                 break
         if final is None:
             raise SystemExit("No final report to attach PoCs to (fallback)")
@@ -77,8 +87,19 @@ def attach_pocs_to_report(run_dir: str,
         pocs_raw = load_json(pocs_file)
         pocs = normalize_pocs_input(pocs_raw)
         findings = final.get("findings", [])
+
+        # Hash-join instead of findings x pocs nested scan: one pass seeds
+        # the pocs list, indexes findings by normalized URL and records
+        # already-attached proof_urls per finding for an O(1) dedupe check
+        findings_by_url = {}
+        attached_urls = {}
         for f in findings:
             f.setdefault("pocs", [])
+            raw_url = f.get("used_url") or f.get("target") or ""
+            f_url = norm_url(raw_url)[0] if raw_url else ""
+            if f_url:
+                findings_by_url.setdefault(f_url, []).append(f)
+            attached_urls[id(f)] = {ex.get("proof_url") for ex in f["pocs"]}
 
         attached = 0
         unmapped = []
@@ -95,25 +116,20 @@ def attach_pocs_to_report(run_dir: str,
             if not url:
                 unmapped.append(p)
                 continue
-            normalized = url.strip().rstrip("/")
-            attached_flag = False
-            for f in findings:
-                f_url = (f.get("used_url") or f.get("target") or "").strip().rstrip("/")
-                if not f_url:
-                    continue
-                if normalized == f_url:
-                    cp = {
+            normalized = norm_url(url)[0]
+            matched = findings_by_url.get(normalized)
+            if not matched:
+                unmapped.append(p)
+                continue
+            for f in matched:
+                if url not in attached_urls[id(f)]:
+                    f["pocs"].append({
                         "proof_url": url,
                         "finding_type": p.get("finding_type"),
                         "status": p.get("status"),
-                    }
-                    if not any(cp.get("proof_url") == ex.get("proof_url")
-                               for ex in f["pocs"]):
-                        f["pocs"].append(cp)
-                        attached += 1
-                    attached_flag = True
-            if not attached_flag:
-                unmapped.append(p)
+                    })
+                    attached_urls[id(f)].add(url)
+                    attached += 1
 
         final["findings"] = findings
         meta = final.get("meta", {})
@@ -131,7 +147,7 @@ def attach_pocs_to_report(run_dir: str,
         final["meta"] = meta
 
         out = os.path.join(reports_dir, "final_report_with_pocs.json")
-        write_json(out, final)
+        write_json(out, final, pretty=False)
         return {
             "status": "fallback_attached",
             "report": out,
@@ -142,26 +158,8 @@ def attach_pocs_to_report(run_dir: str,
 
 # CLI helper
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("usage: python3 modules/poc/attach_pocs.py <run_dir> [--multi] [--threshold 0.5] [--dump-top N]")
-        sys.exit(1)
-    rd = sys.argv[1]
-    best = True
-    th = 0.5
-    dump = 0
-    if "--multi" in sys.argv:
-        best = False
-    if "--threshold" in sys.argv:
-        try:
-            idx = sys.argv.index("--threshold") + 1
-            th = float(sys.argv[idx])
-        except Exception:
-            pass
-    if "--dump-top" in sys.argv:
-        try:
-            idx = sys.argv.index("--dump-top") + 1
-            dump = int(sys.argv[idx])
-        except Exception:
-            pass
-    res = attach_pocs_to_report(rd, best_only=best, threshold=th, dump_top_n=dump)
+    args = build_parser(description="Attach PoCs to the final report",
+                        mapper_flags=True).parse_args()
+    res = attach_pocs_to_report(args.run_dir, best_only=not args.multi,
+                                threshold=args.threshold, dump_top_n=args.dump_top)
     print("attach summary:", res)
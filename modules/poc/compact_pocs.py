@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 # modules/poc/compact_pocs.py
-import json, os, sys
+import os, sys
+
+try:
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._cli import build_parser
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._cli import build_parser
 
 def compact(run_dir):
     p = os.path.join(run_dir, "reports", "pocs.json")
     out = os.path.join(run_dir, "reports", "pocs_compact.json")
     if not os.path.exists(p):
         raise SystemExit("pocs.json not found")
-    with open(p) as f:
-        data = json.load(f)
+    data = load_json(p)
     seen = set()
     compacted = []
     for item in data:
@@ -23,12 +30,9 @@ def compact(run_dir):
             "status": (item.get("captured") or {}).get("status"),
             "snippet": ((item.get("captured") or {}).get("snippet") or "")[:200]
         })
-    with open(out, "w") as f:
-        json.dump({"count": len(compacted), "pocs": compacted}, f, indent=2)
+    write_json(out, {"count": len(compacted), "pocs": compacted}, pretty=False)
     print(out)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("usage: python3 modules/poc/compact_pocs.py runs/<domain>/<run>")
-        raise SystemExit(2)
-    compact(sys.argv[1])
+    args = build_parser(description="Compact pocs.json into pocs_compact.json").parse_args()
+    compact(args.run_dir)
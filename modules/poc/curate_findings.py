@@ -9,37 +9,55 @@ Example:
   python3 modules/poc/curate_findings.py runs/testphp.vulnweb.com/poc3
 """
 import sys
-import json
 import os
 from pathlib import Path
-from datetime import datetime
-
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def write_json(path, obj):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-
-def write_md(path, text):
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+try:
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
+
+def write_md(path, lines):
+    # writelines through a 1MB buffer; skips joining thousands of rows into
+    # one giant intermediate string
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(line + "\n" for line in lines)
 
 def key_for_finding(f):
-    # canonical url to dedupe on
+    # canonical url to dedupe on (memoized normalization)
     u = f.get("used_url") or f.get("target") or ""
     t = f.get("type") or ""
-    return f"{t}::{u}"
-
-def find_best_poc_for(finding, pocs_by_url):
-    # prefer proof_url == used_url, else proof_url == target, else any poc containing the host
+    return f"{t}::{norm_url(u)[0] if u else ''}"
+
+def _sev(f):
+    # severity as int; missing/unparseable treated as -1
+    v = f.get("severity")
+    if isinstance(v, int):
+        return v
+    if isinstance(v, str) and v.isdigit():
+        return int(v)
+    return -1
+
+def find_best_poc_for(finding, pocs_by_url, pocs_by_host):
+    # prefer proof_url == used_url, else a poc on the same host, else any poc
+    # with substring containment
     used = finding.get("used_url") or finding.get("target")
     if not used:
         return None
     if used in pocs_by_url:
         return pocs_by_url[used][0]
-    # fallback: match by target host substring
+    # O(1) host-index lookup before resorting to the O(n) substring scan
+    host = urlparse(used).netloc
+    if host and host in pocs_by_host:
+        return pocs_by_host[host][0]
+    # last resort: match by substring containment
     for url, plist in pocs_by_url.items():
         if url and (url in used or used in url):
             return plist[0]
@@ -47,11 +65,8 @@ def find_best_poc_for(finding, pocs_by_url):
     return None
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 modules/poc/curate_findings.py runs/<domain>/<run-id>")
-        sys.exit(1)
-
-    run_dir = Path(sys.argv[1])
+    args = build_parser(description="Curate and dedupe report findings").parse_args()
+    run_dir = Path(args.run_dir)
     if not run_dir.exists() or not run_dir.is_dir():
         print("Run directory not found:", run_dir)
         sys.exit(1)
@@ -61,21 +76,26 @@ def main():
         print("Reports directory not found:", reports_dir)
         sys.exit(1)
 
+    # One directory listing instead of a stat per candidate file name
+    report_names = {e.name for e in os.scandir(reports_dir) if e.is_file()}
+
     # try to locate existing report that contains findings + pocs
     candidates = [
-        reports_dir / "final_report_with_pocs_map.json",
-        reports_dir / "final_report_with_pocs.json",
-        reports_dir / "final_report.json",
+        "final_report_with_pocs_map.json",
+        "final_report_with_pocs.json",
+        "final_report.json",
     ]
     report = None
-    for c in candidates:
-        if c.exists():
+    source_name = None
+    for name in candidates:
+        if name in report_names:
             try:
-                report = load_json(c)
-                print("Loaded report:", c.name)
+                report = load_json(reports_dir / name)
+                source_name = name
+                print("Loaded report:", name)
                 break
             except Exception as e:
-                print("Failed to load", c, e)
+                print("Failed to load", reports_dir / name, e)
     if report is None:
         print("No usable final report found in", reports_dir)
         sys.exit(1)
@@ -83,20 +103,21 @@ def main():
     # Find pocs array either embedded or in companion file
     pocs = report.get("pocs") or report.get("meta", {}).get("pocs") or None
     if not pocs:
-        alt = reports_dir / "pocs_compact.json"
-        if alt.exists():
-            pocs = load_json(alt).get("pocs") if isinstance(load_json(alt), dict) and "pocs" in load_json(alt) else load_json(alt)
+        if "pocs_compact.json" in report_names:
+            raw = load_json(reports_dir / "pocs_compact.json")
+            pocs = raw.get("pocs") if isinstance(raw, dict) and "pocs" in raw else raw
             print("Loaded companion pocs_compact.json")
     if not pocs:
         # try pocs.json
-        alt2 = reports_dir / "pocs.json"
-        if alt2.exists():
-            pocs = load_json(alt2)
+        if "pocs.json" in report_names:
+            pocs = load_json(reports_dir / "pocs.json")
             print("Loaded companion pocs.json")
     pocs = pocs or []
 
-    # Index pocs by proof_url (preserve list in case multiple)
+    # Index pocs by proof_url (preserve list in case multiple) and by host
+    # for the fallback lookup in find_best_poc_for
     pocs_by_url = {}
+    pocs_by_host = {}
     for p in pocs:
         if not isinstance(p, dict):
             continue
@@ -104,31 +125,32 @@ def main():
         if url not in pocs_by_url:
             pocs_by_url[url] = []
         pocs_by_url[url].append(p)
+        host = urlparse(url).netloc if url else ""
+        if host:
+            pocs_by_host.setdefault(host, []).append(p)
 
     findings = report.get("findings") or []
     if not isinstance(findings, list):
         print("Report findings missing or not a list")
         sys.exit(1)
 
-    # Dedupe: keep highest severity for same (type,url) key
+    # Dedupe: keep highest severity for same (type,url) key. Severity is
+    # normalized once per finding and carried alongside the reference, so
+    # each finding is parsed exactly once and never copied here (the curated
+    # loop below takes its own copy before mutating).
     dedup = {}
     for f in findings:
         k = key_for_finding(f)
-        existing = dedup.get(k)
-        if existing is None:
-            dedup[k] = dict(f)  # copy
-        else:
-            # compare severity (int), missing severity treated as -1
-            s_new = f.get("severity", -1) if isinstance(f.get("severity", None), int) else (int(f.get("severity")) if isinstance(f.get("severity"), str) and f.get("severity").isdigit() else -1)
-            s_old = existing.get("severity", -1) if isinstance(existing.get("severity", None), int) else (int(existing.get("severity")) if isinstance(existing.get("severity"), str) and existing.get("severity").isdigit() else -1)
-            if s_new > s_old:
-                dedup[k] = dict(f)
+        s = _sev(f)
+        cur = dedup.get(k)
+        if cur is None or s > cur[0]:
+            dedup[k] = (s, f)
 
     curated_findings = []
-    for k, f in dedup.items():
+    for k, (s, f) in dedup.items():
         fcopy = dict(f)
         # attach one PoC if available
-        poc = find_best_poc_for(fcopy, pocs_by_url)
+        poc = find_best_poc_for(fcopy, pocs_by_url, pocs_by_host)
         if poc:
             fcopy["poc"] = {
                 "proof_url": poc.get("proof_url") or poc.get("target") or poc.get("url"),
@@ -140,11 +162,11 @@ def main():
         curated_findings.append(fcopy)
 
     # Sort curated findings by severity desc, then type
-    curated_findings.sort(key=lambda x: (-(x.get("severity") or 0), x.get("type") or ""))
+    curated_findings.sort(key=lambda x: (-_sev(x), x.get("type") or ""))
 
     out_json = {
-        "generated_at": datetime.utcnow().isoformat() + "Z",
-        "source_report": c.name if 'c' in locals() else None,
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "source_report": source_name,
         "curated_count": len(curated_findings),
         "findings": curated_findings
     }
@@ -162,17 +184,21 @@ def main():
     md_lines.append("")
     md_lines.append("| # | Type | Target | Severity | PoC URL | PoC status |")
     md_lines.append("|---:|---|---|---:|---|---|")
-    for i, f in enumerate(curated_findings, start=1):
-        t = f.get("type","")
-        u = (f.get("used_url") or f.get("target") or "")
-        s = f.get("severity")
-        poc = f.get("poc")
-        poc_url = poc.get("proof_url") if poc else ""
-        poc_status = poc.get("status") if poc else ""
-        md_lines.append(f"| {i} | {t} | {u} | {s} | {poc_url} | {poc_status} |")
-
-    md_text = "\n".join(md_lines) + "\n"
-    write_md(out_md_path, md_text)
+    # struct-of-arrays: one dict-extraction pass fills parallel columns, the
+    # render loop then only does tuple/list indexing
+    types, targets, sevs, poc_urls, poc_statuses = [], [], [], [], []
+    for f in curated_findings:
+        poc = f.get("poc") or {}
+        types.append(f.get("type", ""))
+        targets.append(f.get("used_url") or f.get("target") or "")
+        sevs.append(f.get("severity"))
+        poc_urls.append(poc.get("proof_url", ""))
+        poc_statuses.append(poc.get("status", ""))
+    md_lines.extend(
+        f"| {i + 1} | {types[i]} | {targets[i]} | {sevs[i]} | {poc_urls[i]} | {poc_statuses[i]} |"
+        for i in range(len(curated_findings)))
+
+    write_md(out_md_path, md_lines)
 
     print("Wrote:", out_json_path)
     print("Wrote:", out_md_path)
@@ -13,72 +13,55 @@ Outputs:
 
 PoCs are just read-only examples (curl + sample payload) and DO NOT perform any network action.
 """
+import shlex
 import sys
-import json
 from pathlib import Path
 from urllib.parse import urlparse, urlencode
 
-def load_json(p: Path):
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-def write_json(p: Path, obj):
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-
-def build_xss_poc(url, param_name=None, method="GET"):
-    marker = "<script>alert(1)</script>"
+try:
+    from modules.poc._jsonio import load_json, write_json, write_json_stream
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from modules.poc._jsonio import load_json, write_json, write_json_stream
+    from modules.poc._urls import norm_url
+    from modules.poc._cli import build_parser
+
+# Finding types that carry no vulnerability and get no PoC
+_SKIP_TYPES = frozenset({"none", "no-vuln", "n/a", ""})
+
+# The three curl shapes, precomputed once; shlex.quote makes the payload/url
+# escaping robust instead of relying on bare double quotes
+_CURL_GET_PARAM = "curl -G --silent --show-error --data-urlencode {data} {url}"
+_CURL_GET_PLAIN = "curl --silent --show-error {url}"
+_CURL_POST = "curl -X POST -d {data} {url}"
+
+def _build_poc(url, payload, param_name, method):
     if method.upper() == "GET":
-        if "?" in url:
-            return {
-                "method": "GET",
-                "payload": marker,
-                "curl_example": f"curl -G --silent --show-error --data-urlencode \"{param_name}={marker}\" \"{url.split('?')[0]}\""
-            }
+        base, sep, _ = url.partition("?")
+        if sep:
+            curl = _CURL_GET_PARAM.format(data=shlex.quote(f"{param_name}={payload}"),
+                                          url=shlex.quote(base))
         else:
             # no param known
-            return {
-                "method": "GET",
-                "payload": marker,
-                "curl_example": f"curl --silent --show-error \"{url}\""
-            }
-    else:
-        # POST
-        return {
-            "method": "POST",
-            "payload": marker,
-            "curl_example": f"curl -X POST -d \"{param_name}={marker}\" \"{url}\""
-        }
+            curl = _CURL_GET_PLAIN.format(url=shlex.quote(url))
+        return {"method": "GET", "payload": payload, "curl_example": curl}
+    return {"method": "POST",
+            "payload": payload,
+            "curl_example": _CURL_POST.format(data=shlex.quote(f"{param_name}={payload}"),
+                                              url=shlex.quote(url))}
+
+def build_xss_poc(url, param_name=None, method="GET"):
+    return _build_poc(url, "<script>alert(1)</script>", param_name, method)
 
 def build_sqli_poc(url, param_name=None, method="GET"):
     # non-destructive: use a tautology or benign time-free probe (no heavy payload)
-    payload = "' OR '1'='1"
-    if method.upper() == "GET":
-        if "?" in url:
-            return {
-                "method": "GET",
-                "payload": payload,
-                "curl_example": f"curl -G --silent --show-error --data-urlencode \"{param_name}={payload}\" \"{url.split('?')[0]}\""
-            }
-        else:
-            return {
-                "method": "GET",
-                "payload": payload,
-                "curl_example": f"curl --silent --show-error \"{url}\""
-            }
-    else:
-        return {
-            "method": "POST",
-            "payload": payload,
-            "curl_example": f"curl -X POST -d \"{param_name}={payload}\" \"{url}\""
-        }
+    return _build_poc(url, "' OR '1'='1", param_name, method)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 modules/poc/generate_pocs.py runs/<domain>/<run-id>")
-        sys.exit(1)
-
-    run_dir = Path(sys.argv[1])
+    args = build_parser(description="Generate non-destructive PoC snippets").parse_args()
+    run_dir = Path(args.run_dir)
     reports_dir = run_dir / "reports"
     if not reports_dir.exists():
         print("Reports folder not found:", reports_dir)
@@ -99,7 +82,7 @@ def main():
         print("No final report found in", reports_dir)
         sys.exit(1)
 
-    data = json.loads(report.read_text(encoding="utf-8"))
+    data = load_json(report)
     findings = data.get("findings", [])
 
     pocs = []
@@ -107,17 +90,13 @@ def main():
 
     for f in findings:
         ftype = (f.get("type") or "").lower()
-        # skip 'none' findings (no vuln)
-        if "none" in ftype:
+        # skip no-vuln findings: O(1) set lookup instead of a substring scan
+        if ftype in _SKIP_TYPES:
             continue
 
         used = f.get("used_url") or f.get("target") or ""
-        # extract param name if present (simple heuristic)
-        param_name = None
-        if "?" in used:
-            qs = used.split("?", 1)[1]
-            if "=" in qs:
-                param_name = qs.split("=")[0]
+        # first query-param name if present (memoized)
+        param_name = norm_url(used)[3] if used else None
 
         poc = {
             "finding_type": f.get("type"),
@@ -165,12 +144,32 @@ def main():
             "curl": poc.get("curl")
         })
 
-    # write files
-    write_json(reports_dir / "pocs.json", pocs)
-    write_json(reports_dir / "pocs_compact.json", {"count": len(compact), "pocs": compact})
+    flush_pocs(pocs, reports_dir, compact=compact)
 
     print("Wrote", reports_dir / "pocs.json")
     print("Wrote", reports_dir / "pocs_compact.json")
 
+
+def flush_pocs(pocs_list, reports_dir, compact=None):
+    """Write the collected PoCs to disk in one shot.
+
+    Callers that generate PoCs incrementally should accumulate them in a
+    list and call this exactly once at the end — re-dumping the full file
+    after every appended PoC turns generation into an O(n^2) rewrite.
+    """
+    reports_dir = Path(reports_dir)
+    if compact is None:
+        compact = [{
+            "proof_url": p.get("proof_url"),
+            "finding_type": p.get("finding_type"),
+            "target": p.get("target"),
+            "status": p.get("status"),
+            "curl": p.get("curl"),
+        } for p in pocs_list]
+    # pocs.json is streamed element-wise so peak memory is one serialized
+    # entry; the compact entries are tiny and stay in one buffered write
+    write_json_stream(reports_dir / "pocs.json", pocs_list)
+    write_json(reports_dir / "pocs_compact.json", {"count": len(compact), "pocs": compact}, pretty=False)
+
 if __name__ == "__main__":
     main()
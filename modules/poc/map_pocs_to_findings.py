@@ -8,50 +8,74 @@ Improved mapper with:
 Outputs final_report_with_pocs_map.json and diagnostics in <run>/reports/
 """
 from __future__ import annotations
-import json
+import functools
+import heapq
 import os
+import re
 import sys
 import urllib.parse
 from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
 
-# ---------- I/O helpers ----------
-def load_json(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+except Exception:
+    _rf_fuzz = None  # type: ignore
 
-def write_json(path: str, obj: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
+# ---------- I/O helpers ----------
+try:
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._cli import build_parser
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from modules.poc._jsonio import load_json, write_json
+    from modules.poc._cli import build_parser
+
+def scan_reports_dir(reports_dir: str) -> Dict[str, str]:
+    """One directory read mapping file name -> path, replacing a stat call
+    per candidate file name."""
+    try:
+        return {e.name: e.path for e in os.scandir(reports_dir) if e.is_file()}
+    except OSError:
+        return {}
 
 def find_pocs_file(run_dir: str) -> Optional[str]:
-    rpt = os.path.join(run_dir, "reports")
-    candidates = [
-        os.path.join(rpt, "pocs_compact_unique.json"),
-        os.path.join(rpt, "pocs_compact.json"),
-        os.path.join(rpt, "pocs.json"),
-    ]
-    for c in candidates:
-        if os.path.isfile(c):
-            return c
+    entries = scan_reports_dir(os.path.join(run_dir, "reports"))
+    for name in ("pocs_compact_unique.json", "pocs_compact.json", "pocs.json"):
+        path = entries.get(name)
+        if path:
+            return path
     return None
 
 def find_report_file(run_dir: str) -> Optional[str]:
-    rpt = os.path.join(run_dir, "reports")
-    candidates = [
-        os.path.join(rpt, "final_report_with_pocs.json"),
-        os.path.join(rpt, "final_report.json"),
-    ]
-    for c in candidates:
-        if os.path.isfile(c):
-            return c
+    entries = scan_reports_dir(os.path.join(run_dir, "reports"))
+    for name in ("final_report_with_pocs.json", "final_report.json"):
+        path = entries.get(name)
+        if path:
+            return path
     return None
 
 # ---------- URL normalization helpers ----------
+# The scoring loop calls these on the same PoC URL for every finding and on
+# the same finding URL for every PoC; memoizing collapses the urlparse work
+# to one call per distinct URL instead of one per pair.
+# fast path for the common http(s)://host/path?query shape; anything with
+# fragments, userinfo or exotic schemes falls through to urlparse
+_URL_FAST = re.compile(r"^(https?)://([^/?#]+)(/[^?#]*)?(?:\?([^#]*))?$")
+
+@functools.lru_cache(maxsize=8192)
 def normalize_url(u: Optional[str]) -> Optional[str]:
     if not u:
         return None
     u = u.strip()
+    m = _URL_FAST.match(u)
+    if m:
+        scheme, netloc, path, query = m.groups()
+        path = path or ""
+        if path != "/" and path.endswith("/"):
+            path = path.rstrip("/")
+        out = f"{scheme}://{netloc.lower()}{path}"
+        return f"{out}?{query}" if query else out
     parsed = urllib.parse.urlparse(u)
     scheme = parsed.scheme
     netloc = (parsed.netloc or "").lower()
@@ -63,6 +87,7 @@ def normalize_url(u: Optional[str]) -> Optional[str]:
         return urllib.parse.urlunparse((scheme, netloc, path, "", query, ""))
     return (netloc + path).rstrip("/") if netloc or path else None
 
+@functools.lru_cache(maxsize=8192)
 def url_path_only(u: Optional[str]) -> Optional[str]:
     if not u:
         return None
@@ -71,17 +96,31 @@ def url_path_only(u: Optional[str]) -> Optional[str]:
     path = (parsed.path or "").rstrip("/")
     return f"{net}{path}" if net else (path or None)
 
+@functools.lru_cache(maxsize=8192)
 def host_only(u: Optional[str]) -> Optional[str]:
     if not u:
         return None
     parsed = urllib.parse.urlparse(u)
     return parsed.netloc.lower() if parsed.netloc else None
 
+# callers treat the returned dict as read-only, so sharing the cached
+# instance between lookups is safe. The split is deliberately raw — no
+# percent-decoding — since both sides of the overlap score go through the
+# same function, so the comparison stays consistent and skips the
+# allocation-heavy parse_qs machinery.
+@functools.lru_cache(maxsize=8192)
 def parse_query_params(u: Optional[str]) -> Dict[str, List[str]]:
     if not u:
         return {}
-    parsed = urllib.parse.urlparse(u)
-    return urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
+    q = urllib.parse.urlsplit(u).query
+    if not q:
+        return {}
+    out: Dict[str, List[str]] = {}
+    for kv in q.split("&"):
+        k, _, v = kv.partition("=")
+        if k:
+            out.setdefault(k, []).append(v)
+    return out
 
 # ---------- PoC compacting and dedupe ----------
 def compact_poc(p: Dict[str, Any]) -> Dict[str, Any]:
@@ -107,10 +146,33 @@ def unique_by_proof_url(pocs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 # ---------- Scoring logic ----------
+@functools.lru_cache(maxsize=65536)
+def _fuzzy_ratio_cached(a: str, b: str) -> float:
+    if _rf_fuzz is not None:
+        # C++-backed ratio; the hottest call in the scoring loop
+        return _rf_fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
 def fuzzy_ratio(a: str, b: str) -> float:
     if not a or not b:
         return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+    # ratio() is symmetric, so order the pair to share one cache entry for
+    # (a, b) and (b, a); the same base URLs recur across findings and PoCs
+    if a > b:
+        a, b = b, a
+    return _fuzzy_ratio_cached(a, b)
+
+def _qparam_bitmap(pq: Dict[str, List[str]]) -> int:
+    """64-bit Bloom bitmap of the query-param names.
+
+    A zero AND between two bitmaps proves the name sets are disjoint (no
+    false negatives), so the exact set arithmetic in query_param_score can
+    be skipped for the overwhelmingly common no-overlap pair.
+    """
+    bm = 0
+    for name in pq:
+        bm |= 1 << (hash(name) & 63)
+    return bm
 
 def query_param_score(p_pq: Dict[str, List[str]], f_pq: Dict[str, List[str]]) -> float:
     if not p_pq and not f_pq:
@@ -132,13 +194,15 @@ def query_param_score(p_pq: Dict[str, List[str]], f_pq: Dict[str, List[str]]) ->
     value_score = (exact / total_values) if total_values else 0.0
     return (0.6 * name_score) + (0.4 * value_score)
 
-def score_poc_against_finding(poc: Dict[str, Any], finding: Dict[str, Any]) -> float:
-    W_EXACT  = 0.35   # still strong for exact canonical matches
-    W_PATH   = 0.12   # path equality matters
-    W_HOST   = 0.05   # small host boost
-    W_SUBSTR = 0.08   # substring containment (medium)
-    W_FUZZY   = 0.15  # fuzzy helps when URLs slightly vary
-    W_QPARAM = 0.25   # boost query-param overlap (important)
+W_EXACT  = 0.35   # still strong for exact canonical matches
+W_PATH   = 0.12   # path equality matters
+W_HOST   = 0.05   # small host boost
+W_SUBSTR = 0.08   # substring containment (medium)
+W_FUZZY   = 0.15  # fuzzy helps when URLs slightly vary
+W_QPARAM = 0.25   # boost query-param overlap (important)
+
+def score_poc_against_finding(poc: Dict[str, Any], finding: Dict[str, Any],
+                              accept_threshold: float = 0.0) -> float:
 
 
     poc_url = poc.get("_norm_proof_url") or (poc.get("proof_url") or "")
@@ -159,9 +223,20 @@ def score_poc_against_finding(poc: Dict[str, Any], finding: Dict[str, Any]) -> f
     if hp and hf and hp == hf:
         score += W_HOST
 
-    if poc_url and f_url and (poc_url in f_url or f_url in poc_url):
+    # length-gated containment: only test the direction that can succeed,
+    # saving a full scan per pair (token-heavy URLs make these scans long)
+    if poc_url and f_url and (
+            (len(poc_url) <= len(f_url) and poc_url in f_url)
+            or (len(f_url) < len(poc_url) and f_url in poc_url)):
         score += W_SUBSTR
 
+    # Everything above is dict lookups and equality checks; fuzzy matching
+    # and query parsing dominate the cost. If even a perfect fuzzy + qparam
+    # result cannot reach the acceptance threshold, the pair can never be
+    # attached, so skip the expensive part.
+    if score + W_FUZZY + W_QPARAM < accept_threshold:
+        return 0.0
+
     fuzz = fuzzy_ratio(poc_url, f_url)
     score += W_FUZZY * fuzz
 
@@ -172,6 +247,92 @@ def score_poc_against_finding(poc: Dict[str, Any], finding: Dict[str, Any]) -> f
 
     return min(score, 1.0)
 
+class _FindingCols:
+    """Struct-of-arrays feature columns for the findings.
+
+    One normalization pass up front turns the per-pair scoring into plain
+    comparisons over parallel lists; the mapping loop never touches the
+    finding dicts (or the urlparse machinery) again. URL, path and host
+    strings are interned to small integers so the equality features reduce
+    to int compares (-1 marks a missing value and never matches).
+    """
+
+    def __init__(self, findings: List[Dict[str, Any]]) -> None:
+        self.urls: List[str] = []
+        self.qparams: List[Dict[str, List[str]]] = []
+        self.qbitmaps: List[int] = []
+        self.url_ids: List[int] = []
+        self.path_ids: List[int] = []
+        self.host_ids: List[int] = []
+        self._intern: Dict[str, int] = {}
+        intern_id = self.intern_id
+        for f in findings:
+            raw = f.get("used_url") or f.get("target")
+            nu = normalize_url(raw) or ""
+            self.urls.append(nu)
+            pq = parse_query_params(raw)
+            self.qparams.append(pq)
+            self.qbitmaps.append(_qparam_bitmap(pq))
+            self.url_ids.append(intern_id(nu))
+            self.path_ids.append(intern_id(url_path_only(raw)))
+            self.host_ids.append(intern_id(host_only(raw)))
+
+    def intern_id(self, s: Optional[str]) -> int:
+        if not s:
+            return -1
+        tbl = self._intern
+        return tbl.setdefault(s, len(tbl))
+
+    def lookup_id(self, s: Optional[str]) -> int:
+        """ID for a PoC-side string; unseen strings map to -1 (no match)."""
+        if not s:
+            return -1
+        return self._intern.get(s, -1)
+
+def _score_candidates(poc: Dict[str, Any], cand_idx: List[int],
+                      cols: _FindingCols,
+                      accept_threshold: float) -> List[Tuple[float, int]]:
+    """Score one PoC against the candidate finding indices.
+
+    Same weights and semantics as score_poc_against_finding, but the cheap
+    exact/path/host/substring arithmetic runs over the precomputed feature
+    columns, and fuzzy/query-param scoring only runs for pairs whose upper
+    bound can still reach the threshold.
+    """
+    f_urls, f_qparams = cols.urls, cols.qparams
+    f_url_ids, f_path_ids, f_host_ids = cols.url_ids, cols.path_ids, cols.host_ids
+    raw = poc.get("proof_url")
+    poc_url = poc.get("_norm_proof_url") or (raw or "")
+    lp = len(poc_url)
+    p_url_id = cols.lookup_id(poc_url)
+    p_path_id = cols.lookup_id(url_path_only(raw))
+    p_host_id = cols.lookup_id(host_only(raw))
+    p_q = parse_query_params(raw)
+    p_bm = _qparam_bitmap(p_q)
+    f_qbitmaps = cols.qbitmaps
+
+    out: List[Tuple[float, int]] = []
+    for i in cand_idx:
+        f_url = f_urls[i]
+        score = 0.0
+        if p_url_id >= 0 and p_url_id == f_url_ids[i]:
+            score += W_EXACT
+        if p_path_id >= 0 and p_path_id == f_path_ids[i]:
+            score += W_PATH
+        if p_host_id >= 0 and p_host_id == f_host_ids[i]:
+            score += W_HOST
+        if poc_url and f_url and (
+                (lp <= len(f_url) and poc_url in f_url)
+                or (len(f_url) < lp and f_url in poc_url)):
+            score += W_SUBSTR
+        if score + W_FUZZY + W_QPARAM >= accept_threshold:
+            score += W_FUZZY * fuzzy_ratio(poc_url, f_url)
+            # disjoint name bitmaps -> the exact score is provably 0.0
+            if p_bm & f_qbitmaps[i]:
+                score += W_QPARAM * query_param_score(p_q, f_qparams[i])
+        out.append((min(score, 1.0), i))
+    return out
+
 # ---------- Main mapping routine ----------
 def map_pocs(run_dir: str, best_only: bool = True, accept_threshold: float = 0.5, dump_top_n: int = 0) -> Dict[str, Any]:
     run_dir = run_dir.rstrip("/")
@@ -201,30 +362,59 @@ def map_pocs(run_dir: str, best_only: bool = True, accept_threshold: float = 0.5
     findings = final.get("findings", [])
     for f in findings:
         f.setdefault("pocs", [])
+        # side-channel set for O(1) attach dedupe; stripped before writing
+        f["_poc_url_set"] = {ex.get("proof_url") for ex in f["pocs"]}
 
     unmapped = []
     diagnostics = {"matches": [], "unmapped": []}
 
+    # Inverted index over the findings: almost all PoC/finding pairs share
+    # neither host nor path and would score near zero, so only the findings
+    # matching the PoC's host or netloc+path are scored at all.
+    by_host: Dict[str, List[int]] = {}
+    by_path: Dict[str, List[int]] = {}
+    no_host: List[int] = []
+    for i, f in enumerate(findings):
+        f_raw = f.get("used_url") or f.get("target")
+        h = host_only(f_raw)
+        if h:
+            by_host.setdefault(h, []).append(i)
+        else:
+            no_host.append(i)
+        pth = url_path_only(f_raw)
+        if pth:
+            by_path.setdefault(pth, []).append(i)
+
+    cols = _FindingCols(findings)
+
     for p in pocs:
-        scores: List[Tuple[float, Dict[str, Any]]] = []
-        for f in findings:
-            sc = score_poc_against_finding(p, f)
-            scores.append((sc, f))
-        scores.sort(key=lambda x: x[0], reverse=True)
+        p_raw = p.get("proof_url") or p.get("target")
+        cand_idx = set(by_host.get(host_only(p_raw) or "", ()))
+        cand_idx.update(by_path.get(url_path_only(p_raw) or "", ()))
+        if not cand_idx:
+            # schemeless/odd PoC urls: fall back to the hostless bucket
+            cand_idx.update(no_host)
+        scores: List[Tuple[float, Dict[str, Any]]] = [
+            (sc, findings[i])
+            for sc, i in _score_candidates(p, sorted(cand_idx), cols, accept_threshold)
+        ]
         if not scores:
             p["_unmapped"] = True
             unmapped.append(p)
             diagnostics["unmapped"].append({"poc": compact_poc(p)})
             continue
 
-        top_score, top_finding = scores[0]
+        # single O(F) max instead of sorting all candidates; only the
+        # debug dump needs ordered output, and nlargest covers that
+        top_score, top_finding = max(scores, key=lambda x: x[0])
         attached = False
         cp = compact_poc(p)
 
         if best_only:
             if top_score >= accept_threshold:
-                if not any(cp.get("proof_url") == ex.get("proof_url") for ex in top_finding["pocs"]):
+                if cp.get("proof_url") not in top_finding["_poc_url_set"]:
                     top_finding["pocs"].append(cp)
+                    top_finding["_poc_url_set"].add(cp.get("proof_url"))
                 attached = True
                 diagnostics["matches"].append({
                     "poc": cp, "finding_target": top_finding.get("used_url") or top_finding.get("target"),
@@ -234,8 +424,9 @@ def map_pocs(run_dir: str, best_only: bool = True, accept_threshold: float = 0.5
             attached_any = False
             for sc, f in scores:
                 if sc >= accept_threshold:
-                    if not any(cp.get("proof_url") == ex.get("proof_url") for ex in f["pocs"]):
+                    if cp.get("proof_url") not in f["_poc_url_set"]:
                         f["pocs"].append(cp)
+                        f["_poc_url_set"].add(cp.get("proof_url"))
                     attached_any = True
                     diagnostics["matches"].append({
                         "poc": cp, "finding_target": f.get("used_url") or f.get("target"),
@@ -243,8 +434,9 @@ def map_pocs(run_dir: str, best_only: bool = True, accept_threshold: float = 0.5
                     })
             attached = attached_any
 
-        if dump_top_n and scores:
-            topN = [{"score": sc, "finding_target": (f.get("used_url") or f.get("target")), "finding_type": f.get("type")} for sc, f in scores[:dump_top_n]]
+        if dump_top_n:
+            topN = [{"score": sc, "finding_target": (f.get("used_url") or f.get("target")), "finding_type": f.get("type")}
+                    for sc, f in heapq.nlargest(dump_top_n, scores, key=lambda x: x[0])]
         else:
             topN = []
 
@@ -276,41 +468,25 @@ def map_pocs(run_dir: str, best_only: bool = True, accept_threshold: float = 0.5
         meta["pocs"]["unmapped"] = unmapped_compact
 
     final["meta"] = meta
+    for f in findings:
+        f.pop("_poc_url_set", None)
     final["findings"] = findings
 
     out_path = os.path.join(reports_dir, "final_report_with_pocs_map.json")
-    write_json(out_path, final)
+    write_json(out_path, final, pretty=False)
 
     # write diagnostics debug file
     diagnostics_path = os.path.join(reports_dir, "pocs_mapping_debug.json")
-    write_json(diagnostics_path, diagnostics)
+    write_json(diagnostics_path, diagnostics, pretty=False)
 
     return {"report": out_path, "diagnostics": diagnostics_path, "attached_count": len(pocs) - len(unmapped_compact), "unmapped_count": len(unmapped_compact)}
 
 # ---------- CLI ----------
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("usage: python3 modules/poc/map_pocs_to_findings.py <run_dir> [--multi] [--threshold 0.5] [--dump-top N]")
-        sys.exit(1)
-    run_dir = sys.argv[1]
-    best_only = True
-    threshold = 0.5
-    dump_n = 0
-    if "--multi" in sys.argv:
-        best_only = False
-    if "--threshold" in sys.argv:
-        try:
-            idx = sys.argv.index("--threshold") + 1
-            threshold = float(sys.argv[idx])
-        except Exception:
-            pass
-    if "--dump-top" in sys.argv:
-        try:
-            idx = sys.argv.index("--dump-top") + 1
-            dump_n = int(sys.argv[idx])
-        except Exception:
-            pass
-    out = map_pocs(run_dir, best_only=best_only, accept_threshold=threshold, dump_top_n=dump_n)
+    args = build_parser(description="Map PoCs onto report findings",
+                        mapper_flags=True).parse_args()
+    out = map_pocs(args.run_dir, best_only=not args.multi,
+                   accept_threshold=args.threshold, dump_top_n=args.dump_top)
     print("wrote", out["report"])
     print("diagnostics:", out["diagnostics"])
     print("attached:", out["attached_count"], "unmapped:", out["unmapped_count"])
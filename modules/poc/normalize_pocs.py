@@ -15,19 +15,15 @@ This is intentionally conservative and non-destructive.
 from __future__ import annotations
 import json
 import os
+import sys
 import urllib.parse
 from typing import Any, Dict, List, Optional
 
-
-def load_json(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as fh:
-        return json.load(fh)
-
-
-def write_json(path: str, obj: Any) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(obj, fh, indent=2, ensure_ascii=False)
+try:
+    from modules.poc._jsonio import load_json, write_json
+except ImportError:  # running as a standalone script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from modules.poc._jsonio import load_json, write_json
 
 
 def find_pocs_sources(run_dir: str) -> List[str]:
@@ -137,25 +133,33 @@ def normalize_pocs(run_dir: str) -> Dict[str, Any]:
                     except Exception:
                         continue
 
-    # compact
-    compacted = [compact_poc(p if isinstance(p, dict) else {}) for p in pocs_raw]
+    # one fused pass builds all three views: compacting, deduping by
+    # normalized proof_url and indexing used to be separate traversals that
+    # each re-read every dict
+    compacted: List[Dict[str, Any]] = []
+    unique: List[Dict[str, Any]] = []
+    index: Dict[str, Dict[str, Any]] = {}
+    seen = set()
+    for p in pocs_raw:
+        cp = compact_poc(p if isinstance(p, dict) else {})
+        compacted.append(cp)
+        key = normalize_url(cp.get("proof_url")) or cp.get("proof_url")
+        if not key:
+            # fallback: use stringified raw as dedupe key
+            key = json.dumps(cp.get("raw") or cp, sort_keys=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        cp["_norm_proof_url"] = key
+        unique.append(cp)
+        index[key] = cp
 
-    # write compact list
     compact_path = os.path.join(reports_dir, "pocs_compact.json")
-    write_json(compact_path, {"count": len(compacted), "pocs": compacted})
-
-    # unique by normalized proof_url
-    unique = unique_by_proof_url(compacted)
+    write_json(compact_path, {"count": len(compacted), "pocs": compacted}, pretty=False)
     unique_path = os.path.join(reports_dir, "pocs_compact_unique.json")
-    write_json(unique_path, {"count": len(unique), "pocs": unique})
-
-    # index by normalized proof_url
-    index: Dict[str, Dict[str, Any]] = {}
-    for p in unique:
-        key = p.get("_norm_proof_url") or (p.get("proof_url") or "")
-        index[key] = p
+    write_json(unique_path, {"count": len(unique), "pocs": unique}, pretty=False)
     index_path = os.path.join(reports_dir, "pocs_index.json")
-    write_json(index_path, {"count": len(index), "index": index})
+    write_json(index_path, {"count": len(index), "index": index}, pretty=False)
 
     summary = {
         "wrote": {
@@ -169,7 +173,6 @@ def normalize_pocs(run_dir: str) -> Dict[str, Any]:
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) < 2:
         print("usage: normalize_pocs.py <run_dir>")
         sys.exit(1)
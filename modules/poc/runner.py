@@ -19,6 +19,7 @@ Features:
 """
 from __future__ import annotations
 import asyncio
+import atexit
 import json
 import os
 import re
@@ -48,20 +49,95 @@ def _safe_name_for_url(url: str) -> str:
     s = (s[:80] + "_" + h) if len(s) > 80 else (s + "_" + h)
     return s
 
+def _write_snippet(path: str, raw: bytes) -> None:
+    # skip when an identical body is already on disk (path embeds the body
+    # hash, so existence implies identical content)
+    if os.path.exists(path):
+        return
+    with open(path, "wb") as f:
+        f.write(raw)
+
 def _write_json(path: str, obj: Any) -> None:
     with open(path, "w", encoding="utf-8") as f:
         json.dump(obj, f, indent=2, ensure_ascii=False)
 
+# Shared session: TCP+TLS setup dominates the per-PoC cost, so connections
+# (and the DNS cache) are kept alive across batches instead of being torn
+# down with a per-invocation session.
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Return the process-wide ClientSession, creating it on first use.
+
+    The session is bound to the running loop; if a later batch runs on a
+    fresh loop (each asyncio.run creates one) it is rebuilt there.
+    """
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        connector = aiohttp.TCPConnector(ssl=False, limit=64, limit_per_host=CONCURRENCY,
+                                         ttl_dns_cache=300, use_dns_cache=True)
+        _shared_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={"User-Agent": USER_AGENT},
+            connector=connector)
+        _shared_session_loop = loop
+    return _shared_session
+
+async def close_shared_session() -> None:
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+def _close_shared_session_at_exit() -> None:
+    if _shared_session is not None and not _shared_session.closed:
+        try:
+            asyncio.run(close_shared_session())
+        except Exception:
+            pass
+
+atexit.register(_close_shared_session_at_exit)
+
+# bodies larger than this are fetched with a Range header so the server
+# truncates at the source instead of shipping bytes we would discard
+_FULL_BODY_MAX = 100 * 1024
+
 async def _fetch_with_retries(session: aiohttp.ClientSession, url: str,
                               timeout: int = REQUEST_TIMEOUT,
                               retries: int = RETRIES,
-                              backoff: float = BACKOFF_FACTOR) -> Dict[str, Any]:
+                              backoff: float = BACKOFF_FACTOR,
+                              head_first: bool = True) -> Dict[str, Any]:
+    headers = None
+    if head_first:
+        # cheap HEAD probe: skip the body entirely for non-text content and
+        # ask for a truncated body when the full one is oversized
+        try:
+            async with session.head(url, timeout=timeout, allow_redirects=True) as hresp:
+                ctype = hresp.headers.get("content-type", "")
+                clen = int(hresp.headers.get("content-length") or 0)
+                if ctype and not ctype.startswith("text/") and "json" not in ctype and "xml" not in ctype:
+                    return {
+                        "status": hresp.status,
+                        "content_type": ctype,
+                        "snippet": "",
+                        "raw": b"",
+                        "url": str(hresp.url),
+                        "headers": dict(hresp.headers),
+                    }
+                if clen > _FULL_BODY_MAX:
+                    headers = {"Range": f"bytes=0-{SNIPPET_MAX - 1}"}
+        except Exception:
+            # servers that reject HEAD still get the plain GET below
+            pass
+
     attempt = 0
     last_exc: Optional[Exception] = None
     while attempt <= retries:
         try:
             attempt += 1
-            async with session.get(url, timeout=timeout) as resp:
+            async with session.get(url, timeout=timeout, headers=headers) as resp:
                 status = resp.status
                 content_type = resp.headers.get("content-type", "")
                 # read up to SNIPPET_MAX chars (decode robustly)
@@ -74,6 +150,7 @@ async def _fetch_with_retries(session: aiohttp.ClientSession, url: str,
                     "status": status,
                     "content_type": content_type,
                     "snippet": snippet,
+                    "raw": raw,
                     "url": str(resp.url),
                     "headers": dict(resp.headers),
                 }
@@ -102,14 +179,17 @@ async def _capture_proof(url: str, out_snippet_dir: str, session: aiohttp.Client
         result = await _fetch_with_retries(session, url)
         # persist snippet if available and status is numeric
         status = result.get("status")
+        raw = result.pop("raw", b"")
         snippet_path = None
-        if isinstance(status, int) and result.get("snippet"):
+        if isinstance(status, int) and raw:
             safe = _safe_name_for_url(url)
-            _ensure_dir(out_snippet_dir)
-            snippet_path = os.path.join(out_snippet_dir, f"{safe}.html")
+            # keying the file on the body hash dedupes re-runs: unchanged
+            # content maps to an existing file and the write is skipped
+            body_hash = hashlib.sha256(raw).hexdigest()[:16]
+            snippet_path = os.path.join(out_snippet_dir, f"{safe}_{body_hash}.html")
             try:
-                with open(snippet_path, "w", encoding="utf-8") as f:
-                    f.write(result.get("snippet", "")[:SNIPPET_MAX])
+                # thread-pool write overlaps with in-flight HTTP reads
+                await asyncio.to_thread(_write_snippet, snippet_path, raw)
             except Exception as e:
                 # not fatal; attach note
                 result.setdefault("meta", {})["snippet_write_error"] = str(e)
@@ -127,6 +207,7 @@ async def generate_pocs_for_findings(outdir: str, findings: List[Dict[str, Any]]
     """
     reports_dir = os.path.join(outdir, "reports")
     snippets_dir = os.path.join(outdir, "pocs", "snippets")
+    # created once here instead of per captured response
     _ensure_dir(reports_dir)
     _ensure_dir(snippets_dir)
 
@@ -162,26 +243,23 @@ async def generate_pocs_for_findings(outdir: str, findings: List[Dict[str, Any]]
         deduped.append(c)
     candidates = deduped
 
-    # aiohttp session + concurrency
+    # shared session (kept open across batches) + concurrency
     sem = asyncio.Semaphore(CONCURRENCY)
-    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-    headers = {"User-Agent": USER_AGENT}
-    connector = aiohttp.TCPConnector(ssl=False, limit_per_host=CONCURRENCY)
-
-    async with aiohttp.ClientSession(timeout=timeout, headers=headers, connector=connector) as session:
-        tasks = []
-        for c in candidates:
-            url = c["proof_url"]
-            tasks.append(_capture_proof(url, snippets_dir, session, sem))
-        results = []
-        if tasks:
-            for fut in asyncio.as_completed(tasks):
-                try:
-                    r = await fut
-                    results.append(r)
-                except Exception as e:
-                    # shouldn't happen due to internal handling, but guard anyway
-                    results.append({"status": "error", "error": f"unhandled: {e}"})
+    session = await get_shared_session()
+
+    tasks = []
+    for c in candidates:
+        url = c["proof_url"]
+        tasks.append(_capture_proof(url, snippets_dir, session, sem))
+    results = []
+    if tasks:
+        for fut in asyncio.as_completed(tasks):
+            try:
+                r = await fut
+                results.append(r)
+            except Exception as e:
+                # shouldn't happen due to internal handling, but guard anyway
+                results.append({"status": "error", "error": f"unhandled: {e}"})
 
     # assemble PoC records aligned with findings (compact)
     pocs = []
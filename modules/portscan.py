@@ -1,11 +1,23 @@
-import asyncio, socket, json, os
+import asyncio, json, os
 
-async def _tcp_connect(host, port, timeout=1):
-    loop = asyncio.get_running_loop()
+# Global cap on in-flight connects; one semaphore spans all hosts so a slow
+# target cannot starve the rest of the sweep
+_MAX_CONCURRENT_CONNECTS = 256
+
+async def _tcp_connect(host, port, timeout=1, sem=None):
     try:
-        fut = loop.run_in_executor(None, lambda: socket.create_connection((host, port), timeout))
-        conn = await asyncio.wait_for(fut, timeout+0.5)
-        conn.close()
+        if sem is not None:
+            async with sem:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port), timeout)
+        else:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
         return True
     except Exception:
         return False
@@ -14,14 +26,35 @@ async def async_port_scan(targets, outdir, ports=None):
     if ports is None:
         ports = [80,443,8080,8000,22,21]
     os.makedirs(outdir, exist_ok=True)
-    results = {}
+    hosts = []
+    seen = set()
     for t in targets:
         host = t.split("//")[-1].split("/")[0]
-        results[host] = {}
-        tasks = [ _tcp_connect(host, p) for p in ports ]
-        res = await asyncio.gather(*tasks)
-        for p, r in zip(ports, res):
-            results[host][p] = r
+        if host not in seen:
+            seen.add(host)
+            hosts.append(host)
+
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_CONNECTS)
+    # one flat task list across every (host, port) pair: total time is
+    # bounded by the slowest host instead of the sum over hosts, and the
+    # native asyncio connect is not capped by the executor thread pool
+    nports = len(ports)
+    res = await asyncio.gather(
+        *(_tcp_connect(h, p, sem=sem) for h in hosts for p in ports))
+
+    # packed host x port matrix (one byte per cell) instead of a dict per
+    # probe; the columnar artifact only lists the open cells
+    mat = bytearray(len(hosts) * nports)
+    for k, r in enumerate(res):
+        if r:
+            mat[k] = 1
     with open(f"{outdir}/ports.json","w") as f:
-        json.dump(results, f, indent=2)
-    return results
+        json.dump({
+            "hosts": hosts,
+            "ports": ports,
+            "open": [[k // nports, k % nports] for k in range(len(mat)) if mat[k]],
+        }, f, indent=2)
+
+    # callers still consume the results[host][port] shape
+    return {h: {p: bool(mat[i * nports + j]) for j, p in enumerate(ports)}
+            for i, h in enumerate(hosts)}
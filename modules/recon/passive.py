@@ -1,30 +1,37 @@
 # modules/recon/passive.py
-import asyncio, json, os
+import asyncio, json, os, re
 import httpx
 from modules.utils import resolve_working_url
 
-async def passive_recon(scope, outdir):
-    os.makedirs(outdir, exist_ok=True)
-    results = {}
-    for t in scope.targets:
+async def _probe(client, sem, t):
+    async with sem:
         try:
             working = await resolve_working_url(t, timeout=8.0)
         except Exception as e:
-            results[t] = {"error": repr(e)}
-            continue
-        async with httpx.AsyncClient(timeout=12, headers={"User-Agent":"PenAI-Min/1.0"}) as client:
-            try:
-                r = await client.get(working)
-                results[t] = {"status": r.status_code, "title": _extract_title(r.text), "snippet": r.text[:400], "used_url": working}
-            except Exception as e:
-                results[t] = {"error": repr(e), "used_url": working}
+            return t, {"error": repr(e)}
+        try:
+            r = await client.get(working)
+            return t, {"status": r.status_code, "title": _extract_title(r.text), "snippet": r.text[:400], "used_url": working}
+        except Exception as e:
+            return t, {"error": repr(e), "used_url": working}
+
+async def passive_recon(scope, outdir, concurrency=16):
+    os.makedirs(outdir, exist_ok=True)
+    # one shared client (pooled connections, one TLS context) and all
+    # targets probed concurrently; wall time is the slowest target, not
+    # the sum over targets
+    sem = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(timeout=12, headers={"User-Agent":"PenAI-Min/1.0"}) as client:
+        results = dict(await asyncio.gather(*(_probe(client, sem, t) for t in scope.targets)))
     with open(f"{outdir}/passive.json","w") as f:
         json.dump(results, f, indent=2)
     return results
 
+# titles live in <head>, so scanning the first 2KB is enough; the regex is
+# one pass and, unlike the old find() pair, also matches <TITLE> and
+# attribute-carrying tags
+_TITLE_RE = re.compile(r"<title[^>]*>([^<]*)</title>", re.I)
+
 def _extract_title(html):
-    start = html.find("<title>")
-    end = html.find("</title>")
-    if start!=-1 and end!=-1:
-        return html[start+7:end].strip()
-    return ""
+    m = _TITLE_RE.search(html, 0, 2048)
+    return m.group(1).strip() if m else ""
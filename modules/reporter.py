@@ -1,16 +1,39 @@
 import json, os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+def _dump_json(path, obj):
+    # orjson serializes in one shot several times faster than stdlib json;
+    # default=str covers datetimes and other non-JSON-native values
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, default=str,
+                                 option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w") as f:
+            f.write(json.dumps(obj, indent=2, ensure_ascii=False, default=str))
+
+def _dump_txt(path, meta, findings):
+    with open(path, "w", buffering=1 << 20) as f:
+        # encode everything in memory and write once instead of a pair
+        # of small writes per finding
+        parts = ["Final report\nMeta:\n", json.dumps(meta, indent=2), "\nFindings:\n"]
+        parts.extend(json.dumps(item, indent=2) + "\n\n" for item in findings)
+        f.write("".join(parts))
 
 class Reporter:
     @staticmethod
     def write_reports(outdir, meta, findings):
         os.makedirs(f"{outdir}/reports", exist_ok=True)
-        with open(f"{outdir}/reports/final_report.json","w") as f:
-            json.dump({"meta":meta,"findings":findings}, f, indent=2)
-        with open(f"{outdir}/reports/final_report.txt","w") as f:
-            f.write("Final report\n")
-            f.write("Meta:\n")
-            f.write(json.dumps(meta, indent=2))
-            f.write("\nFindings:\n")
-            for item in findings:
-                f.write(json.dumps(item, indent=2))
-                f.write("\n\n")
+        # the two files are independent and the GIL drops during file I/O,
+        # so writing them from a small pool overlaps the disk waits
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            json_fut = ex.submit(_dump_json, f"{outdir}/reports/final_report.json",
+                                 {"meta": meta, "findings": findings})
+            txt_fut = ex.submit(_dump_txt, f"{outdir}/reports/final_report.txt", meta, findings)
+            json_fut.result()
+            txt_fut.result()
@@ -4,28 +4,36 @@ Reporter Module for PenAI
 Initialization file for the reporter package.
 """
 
-# Import all reporter modules to make them available
-from .summary_report import generate_summary_report
-from .enhanced_reporter import generate_enhanced_report, EnhancedReporter
-from .visualization import generate_visualization_report
-from .export_formats import export_all_formats
-from .false_positive_reduction import reduce_false_positives
-from .trend_analysis import generate_trend_analysis_report, save_trend_report
-from .threat_modeling import generate_threat_model, enhance_report_with_threat_modeling
-from .root_cause_analysis import perform_root_cause_analysis
-from .advanced_analytics import run_comprehensive_analysis
+# Submodules are loaded lazily (PEP 562): importing the package costs
+# nothing until a reporter function is actually used, so callers that only
+# need the basic report never pay for the analytics stack.
+_LAZY = {
+    "generate_summary_report": "summary_report",
+    "generate_enhanced_report": "enhanced_reporter",
+    "EnhancedReporter": "enhanced_reporter",
+    "generate_visualization_report": "visualization",
+    "export_all_formats": "export_formats",
+    "reduce_false_positives": "false_positive_reduction",
+    "generate_trend_analysis_report": "trend_analysis",
+    "save_trend_report": "trend_analysis",
+    "generate_threat_model": "threat_modeling",
+    "enhance_report_with_threat_modeling": "threat_modeling",
+    "perform_root_cause_analysis": "root_cause_analysis",
+    "run_comprehensive_analysis": "advanced_analytics",
+}
 
-__all__ = [
-    "generate_summary_report",
-    "generate_enhanced_report",
-    "EnhancedReporter",
-    "generate_visualization_report",
-    "export_all_formats",
-    "reduce_false_positives",
-    "generate_trend_analysis_report",
-    "save_trend_report",
-    "generate_threat_model",
-    "enhance_report_with_threat_modeling",
-    "perform_root_cause_analysis",
-    "run_comprehensive_analysis"
-]
\ No newline at end of file
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    submodule = _LAZY.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    val = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = val  # cache so the hook only fires once per name
+    return val
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
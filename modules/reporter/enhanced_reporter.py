@@ -6,10 +6,35 @@ Provides executive summaries, compliance mapping, and advanced visualization cap
 
 import json
 import os
+import re
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 import datetime
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+def _dump_json(path: str, obj: Any, pretty: bool = True) -> None:
+    """Serialize obj in one shot (orjson when installed) and write once.
+
+    pretty=False emits compact JSON for machine-consumed files, roughly
+    halving the bytes written for deeply nested reports.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, default=str, option=option))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            if pretty:
+                f.write(json.dumps(obj, indent=2, ensure_ascii=False, default=str))
+            else:
+                f.write(json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str))
+
 # Compliance standards mapping
 COMPLIANCE_MAPPING = {
     "owasp_top_10_2021": {
@@ -44,6 +69,32 @@ COMPLIANCE_MAPPING = {
     }
 }
 
+# One alternation regex per standard plus keyword -> controls lookup: a
+# finding's type is scanned once in C instead of walking every control's
+# keyword list in Python. A keyword can appear under several controls
+# (e.g. "sqli"), so the lookup maps to a tuple of controls. The regex is a
+# zero-width lookahead so keywords overlapping at different offsets are all
+# reported ("business-logic" also hits "log"); at any one offset the
+# alternation captures only the longest keyword, so each keyword's tuple
+# additionally folds in the controls of every shorter keyword it contains
+# ("login" carries "log"'s controls), matching the per-keyword "in" checks
+# this replaced.
+_KW2CTRL: Dict[str, Dict[str, tuple]] = {}
+_STD_REGEX: Dict[str, "re.Pattern"] = {}
+for _std, _controls in COMPLIANCE_MAPPING.items():
+    _kw_map: Dict[str, List[str]] = {}
+    for _ctrl, _kws in _controls.items():
+        for _kw in _kws:
+            _kw_map.setdefault(_kw, []).append(_ctrl)
+    _KW2CTRL[_std] = {
+        _kw: tuple(dict.fromkeys(
+            _c for _k2, _ctrls in _kw_map.items() if _k2 in _kw for _c in _ctrls))
+        for _kw in _kw_map
+    }
+    _STD_REGEX[_std] = re.compile(
+        "(?=(" + "|".join(re.escape(k) for k in sorted(_kw_map, key=len, reverse=True)) + "))")
+del _std, _controls, _ctrl, _kws, _kw, _kw_map
+
 # Asset criticality scoring based on path
 ASSET_CRITICALITY = {
     5.0: ["/admin", "/api", "/payment", "/checkout"],
@@ -53,29 +104,124 @@ ASSET_CRITICALITY = {
     1.0: []  # Default
 }
 
+# flattened at import: one compiled alternation per score band, tested from
+# the highest band down, replaces the nested dict/list walk per finding
+_CRIT_RX = [(score, re.compile("|".join(map(re.escape, paths))))
+            for score, paths in sorted(ASSET_CRITICALITY.items(), reverse=True)
+            if paths]
+
 def calculate_asset_criticality(target_url: str) -> float:
     """Calculate asset criticality score based on URL path."""
-    target_lower = target_url.lower()
-    for score, paths in ASSET_CRITICALITY.items():
-        for path in paths:
-            if path in target_lower:
-                return score
+    return _criticality_from_lower(target_url.lower())
+
+def _criticality_from_lower(target_lower: str) -> float:
+    """Band scan for callers that already hold the lowercased target."""
+    for score, rx in _CRIT_RX:
+        if rx.search(target_lower):
+            return score
     return 1.0  # Default score
 
+# Static lookup tables built once at import instead of per call
+_VULN_DESCRIPTIONS = {
+    "sqli": "SQL Injection vulnerabilities allow attackers to execute malicious SQL queries, potentially accessing, modifying, or deleting sensitive data.",
+    "xss-reflected": "Reflected Cross-Site Scripting (XSS) occurs when user input is immediately returned in search results, error messages, or any other response that includes some or all of the input.",
+    "xss-stored": "Stored Cross-Site Scripting (XSS) occurs when user input is stored on the target server and then displayed to users without proper sanitization.",
+    "idor": "Insecure Direct Object References occur when an application exposes a reference to an internal implementation object without proper access control.",
+    "auth-bypass": "Authentication Bypass vulnerabilities allow attackers to gain access to restricted content without proper authentication.",
+    "ssrf": "Server-Side Request Forgery (SSRF) occurs when an application fetches a remote resource without validating the user-supplied URL.",
+    "crypto-failure": "Cryptographic Failures occur when applications do not properly protect sensitive data through encryption or use weak cryptographic algorithms."
+}
+
+_REMEDIATION_STEPS = {
+    "sqli": [
+        "Use parameterized queries or prepared statements for all database interactions",
+        "Implement input validation and sanitization for all user-supplied data",
+        "Apply the principle of least privilege for database accounts",
+        "Regularly update and patch database management systems",
+        "Use ORM frameworks that automatically handle parameterization"
+    ],
+    "xss-reflected": [
+        "Implement proper output encoding for all user-supplied data",
+        "Use Content Security Policy (CSP) headers to restrict script execution",
+        "Validate and sanitize all input before processing",
+        "Implement proper session management and authentication",
+        "Use modern web frameworks with built-in XSS protection"
+    ],
+    "idor": [
+        "Implement proper access control checks for all object references",
+        "Use indirect object references or per-user object mappings",
+        "Validate that users have permission to access requested objects",
+        "Implement server-side session management",
+        "Use UUIDs instead of sequential IDs where possible"
+    ]
+}
+
+_SECURE_EXAMPLES = {
+    "sqli": '''# Vulnerable code
+query = "SELECT * FROM users WHERE username = '" + username + "' AND password = '" + password + "'"
+
+# Secure code using parameterized queries
+query = "SELECT * FROM users WHERE username = %s AND password = %s"
+cursor.execute(query, (username, password))''',
+    "xss-reflected": '''# Vulnerable code
+print("<h1>Search results for: " + user_input + "</h1>")
+
+# Secure code using output encoding
+import html
+print("<h1>Search results for: " + html.escape(user_input) + "</h1>")'''
+}
+
+_CONFIG_FIXES = {
+    "crypto-failure": [
+        "Enforce TLS 1.2 or higher for all connections",
+        "Use strong cipher suites and disable weak ones",
+        "Implement HTTP Strict Transport Security (HSTS)",
+        "Use secure flags for cookies",
+        "Regularly rotate encryption keys"
+    ],
+    "auth-bypass": [
+        "Implement multi-factor authentication",
+        "Enforce strong password policies",
+        "Use secure session management with proper timeouts",
+        "Implement account lockout mechanisms",
+        "Regularly review access control policies"
+    ]
+}
+
+_DEFAULT_REMEDIATION = ["Implement proper input validation", "Apply security best practices", "Regularly update dependencies"]
+_DEFAULT_EXAMPLE = "# Refer to security best practices for secure coding examples"
+_DEFAULT_CONFIG_FIXES = ["Refer to security best practices for configuration guidance"]
+
 class EnhancedReporter:
     """Enhanced reporting capabilities for PenAI."""
     
     @staticmethod
-    def generate_executive_summary(findings: List[Dict[str, Any]], meta: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate an executive summary translating technical findings into business impact."""
+    def generate_executive_summary(findings: List[Dict[str, Any]], meta: Dict[str, Any],
+                                   compliance: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """Generate an executive summary translating technical findings into business impact.
+
+        compliance lets callers that already computed _map_to_compliance
+        pass it in instead of mapping the findings a second time.
+        """
+        # one pass buckets severities and counts exposure-prone types,
+        # replacing four separate traversals of the findings list
         total_findings = len(findings)
-        critical_findings = len([f for f in findings if f.get("severity", 0) >= 5])
-        high_findings = len([f for f in findings if f.get("severity", 0) == 4])
-        medium_findings = len([f for f in findings if f.get("severity", 0) == 3])
+        critical_findings = high_findings = medium_findings = 0
+        potential_data_exposure = 0
+        for f in findings:
+            sev = f.get("severity", 0)
+            if sev >= 5:
+                critical_findings += 1
+            elif sev == 4:
+                high_findings += 1
+            elif sev == 3:
+                medium_findings += 1
+            ftype = f.get("_type_lc") or f.get("type", "")
+            if "sqli" in ftype or "xss" in ftype:
+                potential_data_exposure += 1
         
         # Calculate business impact
         potential_downtime = critical_findings * 8 + high_findings * 4 + medium_findings * 2  # hours
-        potential_data_exposure = len([f for f in findings if "sqli" in f.get("type", "") or "xss" in f.get("type", "")])
         estimated_risk_level = "HIGH" if critical_findings > 0 else "MEDIUM" if high_findings > 0 else "LOW"
         
         return {
@@ -86,20 +232,18 @@ class EnhancedReporter:
                 "potential_business_impact": {
                     "estimated_downtime_hours": potential_downtime,
                     "potential_data_exposure": potential_data_exposure,
-                    "compliance_risks": EnhancedReporter._map_to_compliance(findings)
+                    "compliance_risks": (compliance if compliance is not None
+                                         else EnhancedReporter._map_to_compliance(findings))
                 },
                 "immediate_actions_required": critical_findings > 0,
-                "overall_security_posture": EnhancedReporter._assess_security_posture(findings)
+                "overall_security_posture": EnhancedReporter._assess_security_posture(
+                    critical_findings, high_findings, total_findings)
             }
         }
     
     @staticmethod
-    def _assess_security_posture(findings: List[Dict[str, Any]]) -> str:
-        """Assess overall security posture based on findings."""
-        critical = len([f for f in findings if f.get("severity", 0) >= 5])
-        high = len([f for f in findings if f.get("severity", 0) == 4])
-        total = len(findings)
-        
+    def _assess_security_posture(critical: int, high: int, total: int) -> str:
+        """Assess overall security posture from the severity counts."""
         if critical > 0:
             return "CRITICAL - Immediate attention required"
         elif high > 2 or (high > 0 and total > 10):
@@ -114,135 +258,62 @@ class EnhancedReporter:
     @staticmethod
     def _map_to_compliance(findings: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """Map findings to compliance standards."""
-        compliance_results = defaultdict(list)
+        compliance_results = defaultdict(set)
         
         for finding in findings:
-            vuln_type = finding.get("type", "").lower()
-            for standard, controls in COMPLIANCE_MAPPING.items():
-                for control, keywords in controls.items():
-                    for keyword in keywords:
-                        if keyword in vuln_type:
-                            compliance_results[standard].append(control)
-                            break
-        
-        # Remove duplicates
-        for standard in compliance_results:
-            compliance_results[standard] = list(set(compliance_results[standard]))
+            vuln_type = finding.get("_type_lc") or finding.get("type", "").lower()
+            if not vuln_type:
+                continue
+            for standard, rx in _STD_REGEX.items():
+                kw2ctrl = _KW2CTRL[standard]
+                for keyword in rx.findall(vuln_type):
+                    compliance_results[standard].update(kw2ctrl[keyword])
         
-        return dict(compliance_results)
+        return {standard: list(controls) for standard, controls in compliance_results.items()}
     
     @staticmethod
     def generate_remediation_guidance(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate detailed remediation guidance with secure coding examples."""
-        guidance = []
-        vuln_types = defaultdict(list)
-        
-        # Group findings by type
+        # the grouping pass tracks max severity and the target set directly,
+        # so each finding is touched exactly once
+        max_sev: Dict[str, int] = {}
+        targets: Dict[str, set] = defaultdict(set)
         for finding in findings:
-            vuln_types[finding.get("type", "unknown")].append(finding)
-        
-        # Generate guidance for each vulnerability type
-        for vuln_type, vuln_list in vuln_types.items():
-            if not vuln_list:
-                continue
-                
-            # Get the highest severity for this type
-            max_severity = max([v.get("severity", 0) for v in vuln_list])
-            
-            guidance_item = {
-                "vulnerability_type": vuln_type,
-                "severity": max_severity,
-                "affected_targets": list(set([v.get("target", "unknown") for v in vuln_list])),
-                "description": EnhancedReporter._get_vuln_description(vuln_type),
-                "remediation_steps": EnhancedReporter._get_remediation_steps(vuln_type),
-                "secure_coding_example": EnhancedReporter._get_secure_coding_example(vuln_type),
-                "configuration_fixes": EnhancedReporter._get_configuration_fixes(vuln_type)
-            }
-            guidance.append(guidance_item)
+            vuln_type = finding.get("type", "unknown")
+            sev = finding.get("severity", 0)
+            if sev > max_sev.get(vuln_type, -1):
+                max_sev[vuln_type] = sev
+            targets[vuln_type].add(finding.get("target", "unknown"))
         
-        return guidance
+        return [{
+            "vulnerability_type": vuln_type,
+            "severity": severity,
+            "affected_targets": list(targets[vuln_type]),
+            "description": _VULN_DESCRIPTIONS.get(vuln_type, f"Vulnerability type: {vuln_type}"),
+            "remediation_steps": _REMEDIATION_STEPS.get(vuln_type, _DEFAULT_REMEDIATION),
+            "secure_coding_example": _SECURE_EXAMPLES.get(vuln_type, _DEFAULT_EXAMPLE),
+            "configuration_fixes": _CONFIG_FIXES.get(vuln_type, _DEFAULT_CONFIG_FIXES),
+        } for vuln_type, severity in max_sev.items()]
     
     @staticmethod
     def _get_vuln_description(vuln_type: str) -> str:
         """Get description for vulnerability type."""
-        descriptions = {
-            "sqli": "SQL Injection vulnerabilities allow attackers to execute malicious SQL queries, potentially accessing, modifying, or deleting sensitive data.",
-            "xss-reflected": "Reflected Cross-Site Scripting (XSS) occurs when user input is immediately returned in search results, error messages, or any other response that includes some or all of the input.",
-            "xss-stored": "Stored Cross-Site Scripting (XSS) occurs when user input is stored on the target server and then displayed to users without proper sanitization.",
-            "idor": "Insecure Direct Object References occur when an application exposes a reference to an internal implementation object without proper access control.",
-            "auth-bypass": "Authentication Bypass vulnerabilities allow attackers to gain access to restricted content without proper authentication.",
-            "ssrf": "Server-Side Request Forgery (SSRF) occurs when an application fetches a remote resource without validating the user-supplied URL.",
-            "crypto-failure": "Cryptographic Failures occur when applications do not properly protect sensitive data through encryption or use weak cryptographic algorithms."
-        }
-        return descriptions.get(vuln_type, f"Vulnerability type: {vuln_type}")
+        return _VULN_DESCRIPTIONS.get(vuln_type, f"Vulnerability type: {vuln_type}")
     
     @staticmethod
     def _get_remediation_steps(vuln_type: str) -> List[str]:
         """Get remediation steps for vulnerability type."""
-        remediation = {
-            "sqli": [
-                "Use parameterized queries or prepared statements for all database interactions",
-                "Implement input validation and sanitization for all user-supplied data",
-                "Apply the principle of least privilege for database accounts",
-                "Regularly update and patch database management systems",
-                "Use ORM frameworks that automatically handle parameterization"
-            ],
-            "xss-reflected": [
-                "Implement proper output encoding for all user-supplied data",
-                "Use Content Security Policy (CSP) headers to restrict script execution",
-                "Validate and sanitize all input before processing",
-                "Implement proper session management and authentication",
-                "Use modern web frameworks with built-in XSS protection"
-            ],
-            "idor": [
-                "Implement proper access control checks for all object references",
-                "Use indirect object references or per-user object mappings",
-                "Validate that users have permission to access requested objects",
-                "Implement server-side session management",
-                "Use UUIDs instead of sequential IDs where possible"
-            ]
-        }
-        return remediation.get(vuln_type, ["Implement proper input validation", "Apply security best practices", "Regularly update dependencies"])
+        return _REMEDIATION_STEPS.get(vuln_type, _DEFAULT_REMEDIATION)
     
     @staticmethod
     def _get_secure_coding_example(vuln_type: str) -> str:
         """Get secure coding example for vulnerability type."""
-        examples = {
-            "sqli": '''# Vulnerable code
-query = "SELECT * FROM users WHERE username = '" + username + "' AND password = '" + password + "'"
-
-# Secure code using parameterized queries
-query = "SELECT * FROM users WHERE username = %s AND password = %s"
-cursor.execute(query, (username, password))''',
-            "xss-reflected": '''# Vulnerable code
-print("<h1>Search results for: " + user_input + "</h1>")
-
-# Secure code using output encoding
-import html
-print("<h1>Search results for: " + html.escape(user_input) + "</h1>")'''
-        }
-        return examples.get(vuln_type, "# Refer to security best practices for secure coding examples")
+        return _SECURE_EXAMPLES.get(vuln_type, _DEFAULT_EXAMPLE)
     
     @staticmethod
     def _get_configuration_fixes(vuln_type: str) -> List[str]:
         """Get configuration fixes for vulnerability type."""
-        fixes = {
-            "crypto-failure": [
-                "Enforce TLS 1.2 or higher for all connections",
-                "Use strong cipher suites and disable weak ones",
-                "Implement HTTP Strict Transport Security (HSTS)",
-                "Use secure flags for cookies",
-                "Regularly rotate encryption keys"
-            ],
-            "auth-bypass": [
-                "Implement multi-factor authentication",
-                "Enforce strong password policies",
-                "Use secure session management with proper timeouts",
-                "Implement account lockout mechanisms",
-                "Regularly review access control policies"
-            ]
-        }
-        return fixes.get(vuln_type, ["Refer to security best practices for configuration guidance"])
+        return _CONFIG_FIXES.get(vuln_type, _DEFAULT_CONFIG_FIXES)
     
     @staticmethod
     def enhance_findings_with_risk_scoring(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -250,41 +321,59 @@ print("<h1>Search results for: " + html.escape(user_input) + "</h1>")'''
         enhanced_findings = []
         
         for finding in findings:
-            enhanced_finding = finding.copy()
-            
-            # Get base severity
             base_severity = finding.get("severity", 1)
-            
-            # Calculate asset criticality
-            target = finding.get("target", "")
-            criticality_score = calculate_asset_criticality(target)
-            
+            # lowercase type and target once here; the summary and
+            # compliance passes read the cached copies instead of
+            # re-lowercasing per traversal
+            type_lc = finding.get("type", "").lower()
+            target_lc = finding.get("target", "").lower()
+            criticality_score = _criticality_from_lower(target_lc)
+
             # Adjust severity based on asset criticality (weighted approach)
             adjusted_severity = min(5, int(base_severity * (1 + (criticality_score - 1) * 0.2)))
-            
-            enhanced_finding["adjusted_severity"] = adjusted_severity
-            enhanced_finding["asset_criticality"] = criticality_score
-            enhanced_finding["risk_factors"] = {
-                "base_severity": base_severity,
+
+            # one C-level dict build instead of copy() plus three inserts
+            enhanced_findings.append({
+                **finding,
+                "_type_lc": type_lc,
+                "_target_lc": target_lc,
+                "adjusted_severity": adjusted_severity,
                 "asset_criticality": criticality_score,
-                "adjusted_severity": adjusted_severity
-            }
-            
-            enhanced_findings.append(enhanced_finding)
+                "risk_factors": {
+                    "base_severity": base_severity,
+                    "asset_criticality": criticality_score,
+                    "adjusted_severity": adjusted_severity
+                },
+            })
         
         return enhanced_findings
 
-def generate_enhanced_report(findings: List[Dict[str, Any]], meta: Dict[str, Any], outdir: str) -> Dict[str, Any]:
-    """Generate an enhanced report with all advanced features."""
+def generate_enhanced_report(findings: List[Dict[str, Any]], meta: Dict[str, Any], outdir: str,
+                             write_to_disk: bool = True) -> Dict[str, Any]:
+    """Generate an enhanced report with all advanced features.
+
+    write_to_disk=False skips the enhanced_report.json write for callers
+    that embed the result in a larger report and serialize it themselves.
+    """
     # Enhance findings with risk scoring
     enhanced_findings = EnhancedReporter.enhance_findings_with_risk_scoring(findings)
     
+    # Compliance mapping is needed both in the summary and at top level;
+    # compute it once
+    compliance = EnhancedReporter._map_to_compliance(enhanced_findings)
+    
     # Generate executive summary
-    executive_summary = EnhancedReporter.generate_executive_summary(enhanced_findings, meta)
+    executive_summary = EnhancedReporter.generate_executive_summary(enhanced_findings, meta, compliance)
     
     # Generate remediation guidance
     remediation_guidance = EnhancedReporter.generate_remediation_guidance(enhanced_findings)
-    
+
+    # the lowercase caches were only for the passes above; drop them so
+    # they never reach the serialized report
+    for f in enhanced_findings:
+        f.pop("_type_lc", None)
+        f.pop("_target_lc", None)
+
     # Create enhanced report
     enhanced_report = {
         "report_metadata": {
@@ -295,15 +384,14 @@ def generate_enhanced_report(findings: List[Dict[str, Any]], meta: Dict[str, Any
         "executive_summary": executive_summary,
         "findings": enhanced_findings,
         "remediation_guidance": remediation_guidance,
-        "compliance_mapping": EnhancedReporter._map_to_compliance(enhanced_findings)
+        "compliance_mapping": compliance
     }
     
     # Write to file
-    os.makedirs(os.path.join(outdir, "reports"), exist_ok=True)
-    report_path = os.path.join(outdir, "reports", "enhanced_report.json")
-    
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(enhanced_report, f, indent=2, ensure_ascii=False)
+    if write_to_disk:
+        os.makedirs(os.path.join(outdir, "reports"), exist_ok=True)
+        report_path = os.path.join(outdir, "reports", "enhanced_report.json")
+        _dump_json(report_path, enhanced_report)
     
     return enhanced_report
 
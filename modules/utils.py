@@ -1,18 +1,32 @@
 # modules/utils.py
+import time
 import httpx
 from urllib.parse import urlparse, urlunparse
 
 DEFAULT_TIMEOUT = 8.0
 
+# Working-scheme cache: once a host answered on a scheme, reuse it for every
+# URL on that host for a while instead of re-probing DNS + TCP per call.
+_RESOLVE_TTL = 300.0
+_RESOLVE_MAXSIZE = 4096
+_resolve_cache = {}  # netloc -> (monotonic_ts, scheme)
+
 async def resolve_working_url(url, timeout=DEFAULT_TIMEOUT):
     """
     Return a reachable URL for the given host. Prefer original scheme,
     fallback to the other (http <-> https). Raises RuntimeError if neither works.
+    Resolved schemes are cached per host for 5 minutes.
     """
     parsed = urlparse(url)
     host = parsed.netloc or parsed.path
     if not host:
         raise RuntimeError(f"Invalid URL: {url}")
+
+    cached = _resolve_cache.get(host)
+    if cached and time.monotonic() - cached[0] < _RESOLVE_TTL:
+        return urlunparse((cached[1], host, parsed.path or "/", parsed.params,
+                           parsed.query or "", parsed.fragment))
+
     candidates = []
     if parsed.scheme in ("http","https"):
         candidates.append(parsed.scheme)
@@ -30,12 +44,20 @@ async def resolve_working_url(url, timeout=DEFAULT_TIMEOUT):
                 try:
                     r = await client.head(test)
                     if r.status_code and r.status_code < 600:
+                        _cache_scheme(host, scheme)
                         return test
                 except Exception:
                     # fallback to GET
                     r = await client.get(test)
                     if r.status_code and r.status_code < 600:
+                        _cache_scheme(host, scheme)
                         return test
         except Exception:
             continue
     raise RuntimeError(f"Neither http nor https reachable for {host}")
+
+
+def _cache_scheme(host, scheme):
+    if len(_resolve_cache) >= _RESOLVE_MAXSIZE:
+        _resolve_cache.pop(next(iter(_resolve_cache)))
+    _resolve_cache[host] = (time.monotonic(), scheme)